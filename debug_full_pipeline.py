@@ -4,7 +4,6 @@ Debug script for full pipeline including plotting.
 import numpy as np
 import sys
 from pathlib import Path
-import yaml
 
 PROJECT_ROOT = Path(__file__).resolve().parent
 sys.path.insert(0, str(PROJECT_ROOT))
@@ -14,9 +13,8 @@ from src.hgen_sm.initialization import initialize_objects
 from src.hgen_sm.determine_sequences import determine_sequences
 
 # Load config
-CONFIG_FILE = PROJECT_ROOT / "config" / "config.yaml"
-with CONFIG_FILE.open("r") as f:
-    cfg = yaml.load(f, Loader=yaml.FullLoader)
+from shared_setup import load_config
+cfg = load_config()
 
 
 def debug_pipeline():
@@ -2,30 +2,21 @@
 Debug script to understand the point merging issue in split surfaces.
 """
 
-import yaml
-from pathlib import Path
 import numpy as np
 
-PROJECT_ROOT = Path(__file__).resolve().parent
-CONFIG_FILE = PROJECT_ROOT / "config" / "config.yaml"
-from config.user_input import RECTANGLE_INPUTS
-
-with CONFIG_FILE.open("r") as f:
-    cfg = yaml.load(f, Loader=yaml.FullLoader)
+from shared_setup import load_config, cached_sequences
+cfg = load_config()
 
 from src.hgen_sm import Part
-from src.hgen_sm import initialize_objects, determine_sequences, create_segments, part_assembly
-from src.hgen_sm.part_assembly.merge_helpers import extract_tabs_from_segments
+from src.hgen_sm import create_segments, part_assembly
+from src.hgen_sm.part_assembly.merge_helpers import extract_tabs_from_segments, merge_points
 
 def main():
     segment_cfg = cfg.get('design_exploration')
     filter_cfg = cfg.get('filter')
 
-    # ---- Import user input ----
-    part = initialize_objects(RECTANGLE_INPUTS)
-
-    # ---- Determine sensible Topologies ----
-    variants = determine_sequences(part, cfg)
+    # ---- Import user input, determine sensible Topologies (cached per process) ----
+    variants = cached_sequences()
 
     # ---- Find ways to connect pairs ----
     for variant_part, sequences in variants:
@@ -78,8 +69,6 @@ def main():
 
             # Now let's manually test the merge
             if len(tab_1_appearances) == 2:
-                from src.hgen_sm.part_assembly.merge_helpers import merge_points
-
                 print(f"\n{'='*60}")
                 print("TESTING MERGE OF TAB 1")
                 print(f"{'='*60}")
@@ -102,13 +91,12 @@ def main():
                     print(f"  {list(merged.keys())}")
 
                     # Check for proper ordering - find where bend points are
-                    point_keys = list(merged.keys())
+                    position = {name: i for i, name in enumerate(merged)}
                     corners = ['A', 'B', 'C', 'D']
                     print(f"\n  Corner positions:")
                     for corner in corners:
-                        if corner in point_keys:
-                            idx = point_keys.index(corner)
-                            print(f"    {corner}: position {idx}")
+                        if corner in position:
+                            print(f"    {corner}: position {position[corner]}")
 
                 else:
                     print(f"\nMerge FAILED!")
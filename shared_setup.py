@@ -0,0 +1,49 @@
+"""
+Shared setup for the test and debug scripts.
+
+Several scripts initialize the same user input and determine the same
+sequences. When they run in one process (e.g. collected by pytest), these
+helpers make sure that work is only done once.
+
+The returned objects are shared between callers and must be treated as
+read-only; copy them before mutating.
+"""
+import copy
+import functools
+from pathlib import Path
+
+import yaml
+
+try:
+    # libyaml C parser, much faster than the pure-Python loaders
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+import config.user_input as user_input
+from src.hgen_sm import initialize_objects, determine_sequences
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+CONFIG_FILE = PROJECT_ROOT / "config" / "config.yaml"
+
+
+@functools.lru_cache(maxsize=None)
+def load_config():
+    """Load config.yaml once per process (the returned dict is shared, do not modify it)."""
+    with CONFIG_FILE.open("r") as f:
+        return yaml.load(f, Loader=SafeLoader)
+
+
+@functools.lru_cache(maxsize=8)
+def cached_initialize(input_name="RECTANGLE_INPUTS"):
+    """Initialize the part for a rectangle input defined in config/user_input.py."""
+    return initialize_objects(getattr(user_input, input_name))
+
+
+@functools.lru_cache(maxsize=8)
+def cached_sequences(input_name="RECTANGLE_INPUTS"):
+    """Determine the (part_variant, sequences) list for a rectangle input."""
+    # determine_sequences modifies the part in place (surface separation),
+    # so work on a copy to keep the cached initialized part untouched
+    part = copy.deepcopy(cached_initialize(input_name))
+    return determine_sequences(part, load_config())
@@ -8,7 +8,7 @@ from src.hgen_sm.data import Part
 from src.hgen_sm.initialization import initialize_objects
 from src.hgen_sm.determine_sequences import determine_sequences
 from src.hgen_sm.create_segments import create_segments 
-from src.hgen_sm.part_assembly import part_assembly
+from src.hgen_sm.part_assembly import part_assembly, compatible_combinations, assemble_combinations
 from src.hgen_sm.plotting.plot_assembly import plot_solutions
 
 # Define what is available when the package is imported
@@ -20,6 +20,8 @@ __all__ = [
     "determine_sequences",
     "create_segments",
     "part_assembly",
+    "compatible_combinations",
+    "assemble_combinations",
     "plot_solutions"
     
 ]
\ No newline at end of file
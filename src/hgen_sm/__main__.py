@@ -2,19 +2,24 @@ import time
 start_time = time.time()
 
 import yaml
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 
 from pathlib import Path
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 CONFIG_FILE = PROJECT_ROOT / "config" / "config.yaml"
 from config.user_input import RECTANGLE_INPUTS
 with CONFIG_FILE.open("r") as f:
-    cfg = yaml.load(f, Loader=yaml.FullLoader)
-import copy
-
+    cfg = yaml.load(f, Loader=SafeLoader)
+import os
 import itertools
+from concurrent.futures import ProcessPoolExecutor
 
 from src.hgen_sm import Part
-from src.hgen_sm import initialize_objects, determine_sequences, create_segments, part_assembly, plot_solutions
+from src.hgen_sm import initialize_objects, determine_sequences, create_segments, compatible_combinations, \
+    assemble_combinations, plot_solutions
 
 # Try to import custom sequence if it exists
 import config.user_input as user_input_module
@@ -38,6 +43,7 @@ def main():
     plot_cfg = cfg.get('plot')
     filter_cfg = cfg.get('filter')
     topo_cfg = cfg.get('topologies', {})
+    assembly_cfg = cfg.get('assembly') or {}
 
     # ---- Import user input ----
     part = initialize_objects(RECTANGLE_INPUTS)
@@ -60,29 +66,61 @@ def main():
     solutions = []
     part_id: int = 0
 
-    for variant_part, sequences in variants:
-        variant_name = "separated" if any('_' in str(tid) for tid in variant_part.tabs.keys()) else "unseparated"
-        print(f"\nProcessing {variant_name} variant with {len(variant_part.tabs)} tabs...")
-
-        for sequence in sequences:
-            segments_library = []
-            for pair in sequence:
-                tab_x = variant_part.tabs[pair[0]]
-                tab_z = variant_part.tabs[pair[1]]
-                segment_tabs = {'tab_x': tab_x, 'tab_z': tab_z}
-                segment = Part(sequence=pair, tabs=segment_tabs)
-                segments_library.append(create_segments(segment, segment_cfg, filter_cfg))
-
-            # ---- Assemble Parts ----
-            variant_part.sequence = sequence
-            for segments_combination in itertools.product(*segments_library):
-                new_part = variant_part.copy()
-                new_segments_combination = copy.deepcopy(segments_combination)
-                new_part = part_assembly(new_part, new_segments_combination, filter_cfg)
-                if new_part == None: continue
-                part_id += 1
-                new_part.part_id = part_id
-                solutions.append(new_part)
+    # Combinations are independent of each other, so they can be assembled in worker processes
+    workers = assembly_cfg.get('workers', 1) or os.cpu_count()
+    chunk_size = assembly_cfg.get('chunk_size', 512)
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    try:
+        for variant_part, sequences in variants:
+            variant_name = "separated" if any('_' in str(tid) for tid in variant_part.tabs.keys()) else "unseparated"
+            print(f"\nProcessing {variant_name} variant with {len(variant_part.tabs)} tabs...")
+
+            # The same pair shows up in many sequences of a variant, its segments only depend on the pair
+            # (segments are cloned before assembly, so the cached lists are never modified)
+            segments_cache = {}
+            if executor is not None:
+                # Pairs are independent of each other, create the segments of all of them in the workers
+                pair_futures = {}
+                for sequence in sequences:
+                    for pair in sequence:
+                        pair_key = tuple(pair)
+                        if pair_key not in pair_futures:
+                            segment_tabs = {'tab_x': variant_part.tabs[pair[0]], 'tab_z': variant_part.tabs[pair[1]]}
+                            segment = Part(sequence=pair, tabs=segment_tabs)
+                            pair_futures[pair_key] = executor.submit(create_segments, segment, segment_cfg, filter_cfg)
+                segments_cache = {pair_key: future.result() for pair_key, future in pair_futures.items()}
+
+            for sequence in sequences:
+                segments_library = []
+                for pair in sequence:
+                    pair_key = tuple(pair)
+                    if pair_key not in segments_cache:
+                        tab_x = variant_part.tabs[pair[0]]
+                        tab_z = variant_part.tabs[pair[1]]
+                        segment_tabs = {'tab_x': tab_x, 'tab_z': tab_z}
+                        segment = Part(sequence=pair, tabs=segment_tabs)
+                        segments_cache[pair_key] = create_segments(segment, segment_cfg, filter_cfg)
+                    segments_library.append(segments_cache[pair_key])
+
+                # ---- Assemble Parts ----
+                variant_part.sequence = sequence
+                combinations = compatible_combinations(segments_library, filter_cfg)
+                if executor is None:
+                    assembled = assemble_combinations(variant_part, combinations, filter_cfg)
+                else:
+                    chunks = iter(lambda: list(itertools.islice(combinations, chunk_size)), [])
+                    futures = [executor.submit(assemble_combinations, variant_part, chunk, filter_cfg) for chunk in chunks]
+                    assembled = [new_part for future in futures for new_part in future.result()]
+
+                for new_part in assembled:
+                    part_id += 1
+                    new_part.part_id = part_id
+                    solutions.append(new_part)
+    finally:
+        # Also stop the workers when segment creation or assembly raises (queued work is dropped then)
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
 
     print("\n--- %s seconds ---" % (time.time() - start_time))
     print(f"Found {len(solutions)} solutions")
@@ -1,15 +1,39 @@
 import numpy as np
 import itertools
 
-from config.design_rules import min_flange_length, min_bend_angle
+from config.design_rules import min_flange_length, min_flange_width, min_bend_angle
 from src.hgen_sm.create_segments.geometry_helpers import calculate_plane, calculate_plane_intersection, \
-    create_bending_point, calculate_flange_points, next_cp
-from src.hgen_sm.create_segments.utils import line_plane_intersection, project_onto_line, normalize, \
-    perp_toward_plane
+    create_bending_points, calculate_flange_points, next_cp
+from src.hgen_sm.create_segments.utils import line_plane_intersection, project_onto_line, normalize, norm3, cross3, \
+    perp_toward_plane, normalize_rows
 from src.hgen_sm.filters import min_flange_width_filter, tab_fully_contains_rectangle, lines_cross, \
     are_corners_neighbours, minimum_angle_filter, thin_segment_filter
 from src.hgen_sm.data import Bend, Tab
 
+# The angle between two planes is below min_bend_angle exactly when |cos| of their normals is
+# above cos(min_bend_angle); comparing cosines saves an arccos per bend candidate
+_MAX_BEND_COS = np.cos(np.radians(min_bend_angle))
+
+
+def _segments_intersect_2d(a1x, a1y, a2x, a2y, b1x, b1y, b2x, b2y):
+    """Check if line segment a1-a2 intersects with b1-b2 in 2D using parametric form."""
+    # Direction vectors
+    d1x, d1y = a2x - a1x, a2y - a1y
+    d2x, d2y = b2x - b1x, b2y - b1y
+
+    # Check for parallel lines
+    cross = d1x * d2y - d1y * d2x
+    if abs(cross) < 1e-10:
+        return False
+
+    # Solve for parameters t and s
+    dx, dy = b1x - a1x, b1y - a1y
+    t = (dx * d2y - dy * d2x) / cross
+    s = (dx * d1y - dy * d1x) / cross
+
+    # Check if intersection is within both segments (excluding endpoints)
+    return 0.01 < t < 0.99 and 0.01 < s < 0.99
+
 
 def diagonals_cross_3d(p0, p3, p4, p7):
     """
@@ -18,39 +42,22 @@ def diagonals_cross_3d(p0, p3, p4, p7):
     This is used to detect self-intersecting intermediate tab polygons.
     Returns True if the diagonals cross in XY, XZ, or YZ projection.
     """
-    def segments_intersect_2d(a1, a2, b1, b2):
-        """Check if line segment a1-a2 intersects with b1-b2 in 2D using parametric form."""
-        # Direction vectors
-        d1 = np.array([a2[0] - a1[0], a2[1] - a1[1]], dtype=float)
-        d2 = np.array([b2[0] - b1[0], b2[1] - b1[1]], dtype=float)
-
-        # Check for parallel lines
-        cross = d1[0] * d2[1] - d1[1] * d2[0]
-        if abs(cross) < 1e-10:
-            return False
-
-        # Solve for parameters t and s
-        diff = np.array([b1[0] - a1[0], b1[1] - a1[1]], dtype=float)
-        t = (diff[0] * d2[1] - diff[1] * d2[0]) / cross
-        s = (diff[0] * d1[1] - diff[1] * d1[0]) / cross
-
-        # Check if intersection is within both segments (excluding endpoints)
-        return 0.01 < t < 0.99 and 0.01 < s < 0.99
-
-    p0, p3, p4, p7 = np.array(p0), np.array(p3), np.array(p4), np.array(p7)
+    # Plain floats: this runs per candidate on 2D points, numpy only adds overhead here
+    x0, y0, z0 = map(float, p0)
+    x3, y3, z3 = map(float, p3)
+    x4, y4, z4 = map(float, p4)
+    x7, y7, z7 = map(float, p7)
 
     # Check XY projection (indices 0, 1)
-    if segments_intersect_2d(p3[:2], p4[:2], p7[:2], p0[:2]):
+    if _segments_intersect_2d(x3, y3, x4, y4, x7, y7, x0, y0):
         return True
 
     # Check XZ projection (indices 0, 2)
-    if segments_intersect_2d([p3[0], p3[2]], [p4[0], p4[2]],
-                              [p7[0], p7[2]], [p0[0], p0[2]]):
+    if _segments_intersect_2d(x3, z3, x4, z4, x7, z7, x0, z0):
         return True
 
     # Check YZ projection (indices 1, 2)
-    if segments_intersect_2d([p3[1], p3[2]], [p4[1], p4[2]],
-                              [p7[1], p7[2]], [p0[1], p0[2]]):
+    if _segments_intersect_2d(y3, z3, y4, z4, y7, z7, y0, z0):
         return True
 
     return False
@@ -72,30 +79,27 @@ def should_swap_z_side_ordering(FPyxL, FPyxR, FPyzR, FPyzL):
     Returns:
         bool: True if z-side ordering should be swapped (L before R)
     """
-    # First try the diagonal crossing check
-    crosses = diagonals_cross_3d(FPyxL, FPyxR, FPyzR, FPyzL)
-
-    FPyxL = np.array(FPyxL)
-    FPyxR = np.array(FPyxR)
-    FPyzR = np.array(FPyzR)
-    FPyzL = np.array(FPyzL)
+    FPyxL = np.asarray(FPyxL, dtype=np.float64)
+    FPyxR = np.asarray(FPyxR, dtype=np.float64)
+    FPyzR = np.asarray(FPyzR, dtype=np.float64)
+    FPyzL = np.asarray(FPyzL, dtype=np.float64)
 
     # Calculate distances for both orderings
     # Default ordering: R-to-R and L-to-L connections
-    dist_default = (np.linalg.norm(FPyzR - FPyxR) +
-                    np.linalg.norm(FPyxL - FPyzL))
+    dist_default = (norm3(FPyzR - FPyxR) +
+                    norm3(FPyxL - FPyzL))
 
     # Swapped ordering: R-to-L and L-to-R connections
-    dist_swapped = (np.linalg.norm(FPyzL - FPyxR) +
-                    np.linalg.norm(FPyxL - FPyzR))
+    dist_swapped = (norm3(FPyzL - FPyxR) +
+                    norm3(FPyxL - FPyzR))
 
     # If distance difference is significant (>1mm), use distance-based decision
     # This handles collinear cases where diagonal crossing check fails
     if abs(dist_default - dist_swapped) > 1.0:
         return dist_swapped < dist_default
 
-    # Otherwise, trust the diagonal crossing check
-    return crosses
+    # Otherwise, trust the diagonal crossing check (only needed in this case)
+    return diagonals_cross_3d(FPyxL, FPyxR, FPyzR, FPyzL)
 
 
 def segments_are_equal(seg1, seg2, tolerance=1e-6):
@@ -109,34 +113,26 @@ def segments_are_equal(seg1, seg2, tolerance=1e-6):
     Returns:
         bool: True if segments are geometrically identical
     """
-    # Compare all points from both segments
-    points1 = []
-    points2 = []
-
-    for tab_key in seg1.tabs:
-        for point_key, point in seg1.tabs[tab_key].points.items():
-            if 'BP' in point_key or 'FP' in point_key:
-                points1.append(np.array(point))
-
-    for tab_key in seg2.tabs:
-        for point_key, point in seg2.tabs[tab_key].points.items():
-            if 'BP' in point_key or 'FP' in point_key:
-                points2.append(np.array(point))
+    # Compare all points from both segments, each gathered into one (N, 3) array
+    points1 = _bend_and_flange_points(seg1)
+    points2 = _bend_and_flange_points(seg2)
 
     if len(points1) != len(points2):
         return False
+    if len(points1) == 0:
+        return True
 
     # Check if all points from seg1 exist in seg2
-    for p1 in points1:
-        found = False
-        for p2 in points2:
-            if np.linalg.norm(p1 - p2) < tolerance:
-                found = True
-                break
-        if not found:
-            return False
+    distances = np.linalg.norm(points1[:, None, :] - points2[None, :, :], axis=2)
+    return bool(np.all(np.any(distances < tolerance, axis=1)))
+
 
-    return True
+def _bend_and_flange_points(segment):
+    """Collect all BP/FP coordinates of a segment into a single (N, 3) array."""
+    points = [point for tab in segment.tabs.values()
+              for point_key, point in tab.points.items()
+              if 'BP' in point_key or 'FP' in point_key]
+    return np.asarray(points, dtype=np.float64).reshape(-1, 3)
 
 
 def is_duplicate_segment(new_segment, segment_library, tolerance=1e-6):
@@ -155,13 +151,8 @@ def calculate_flange_points_with_angle_check(BP1, BP2, planeA, planeB, flange_le
         tuple: (FPAL, FPAR, FPBL, FPBR, angle_too_small)
         If angle is too small, returns (None, None, None, None, True)
     """
-    # Check angle between planes
-    dot_product = np.dot(planeA.orientation, planeB.orientation)
-    dot_product = np.clip(dot_product, -1.0, 1.0)
-    angle_rad = np.arccos(abs(dot_product))
-    angle_deg = np.degrees(angle_rad)
-
-    if angle_deg < min_bend_angle:
+    # Check angle between planes (on the cosine, see _MAX_BEND_COS)
+    if abs(np.dot(planeA.orientation, planeB.orientation)) > _MAX_BEND_COS:
         return None, None, None, None, True
 
     # Calculate flange points
@@ -196,18 +187,20 @@ def one_bend(segment, filter_cfg):
     rect_x = tab_x.rectangle
     rect_z = tab_z.rectangle
 
-    plane_x = calculate_plane(rect_x)
-    plane_z = calculate_plane(rect_z)
+    plane_x = tab_x.plane
+    plane_z = tab_z.plane
+
+    # ---- FILTER: Check if the resulting bend angle would be large enough
+    # Checked before the plane intersection, since it is much cheaper to compute
+    if not minimum_angle_filter(plane_x, plane_z):
+        return None
+
     intersection = calculate_plane_intersection(plane_x, plane_z)
 
     # ---- FILTER: If there is no intersection between the planes, no solution with one bend is possible
     if intersection is None:
         return None
 
-    # ---- FILTER: Check if the resulting bend angle would be large enough
-    if not minimum_angle_filter(plane_x, plane_z):
-        return None
-
     bend = Bend(position=intersection["position"], orientation=intersection["orientation"])
 
     # Use adjacent edge pairs
@@ -218,25 +211,46 @@ def one_bend(segment, filter_cfg):
 
     segment_library = []
 
-    for pair_x in rect_x_edges:
+    # ---- Step 1: Calculate Bending Points by projecting corner pairs onto bend line ----
+    # A bending point only depends on the (corner x, corner z) pair, so all 16 pairs
+    # are computed in one vectorized call and looked up inside the edge loops.
+    corner_ids = ['A', 'B', 'C', 'D']
+    corners_x = tab_x.points_array[[tab_x.point_index[k] for k in corner_ids]]
+    corners_z = tab_z.points_array[[tab_z.point_index[k] for k in corner_ids]]
+    bending_points = create_bending_points(np.repeat(corners_x, 4, axis=0), np.tile(corners_z, (4, 1)), bend)
+    BP_table = {(cp_x, cp_z): bending_points[4 * i + j]
+                for i, cp_x in enumerate(corner_ids) for j, cp_z in enumerate(corner_ids)}
+
+    # ---- FILTER: Is flange wide enough? ----
+    # Checked for all edge pairs at once: row [i, j] of the BPL/BPR index grids belongs to
+    # x edge i and z edge j, the filter compares squared bend lengths like min_flange_width_filter
+    bp_row = {k: i for i, k in enumerate(corner_ids)}
+    rows_L = np.array([[4 * bp_row[L_x] + bp_row[L_z] for L_z, _ in rect_z_edges] for L_x, _ in rect_x_edges])
+    rows_R = np.array([[4 * bp_row[R_x] + bp_row[R_z] for _, R_z in rect_z_edges] for _, R_x in rect_x_edges])
+    bend_vecs = bending_points[rows_R] - bending_points[rows_L]
+    wide_enough = np.einsum('ijk,ijk->ij', bend_vecs, bend_vecs) >= min_flange_width * min_flange_width
+
+    # Plane normals and offsets (n . P = offset) for the flange clearance check
+    normal_x, normal_z = plane_x.orientation, plane_z.orientation
+    offset_x = np.dot(plane_x.position, normal_x)
+    offset_z = np.dot(plane_z.position, normal_z)
+    min_clearance = min_flange_length * 0.5  # Allow 50% of flange length as minimum clearance
+
+    for i, pair_x in enumerate(rect_x_edges):
         CP_xL_id = pair_x[0]
         CP_xL = tab_x.points[CP_xL_id]
         CP_xR_id = pair_x[1]
         CP_xR = tab_x.points[CP_xR_id]
 
-        for pair_z in rect_z_edges:
+        for j in np.flatnonzero(wide_enough[i]):
+            pair_z = rect_z_edges[j]
             CP_zL_id = pair_z[0]
             CP_zL = tab_z.points[CP_zL_id]
             CP_zR_id = pair_z[1]
             CP_zR = tab_z.points[CP_zR_id]
 
-            # ---- Step 1: Calculate Bending Points by projecting corner pairs onto bend line ----
-            BPL = create_bending_point(CP_xL, CP_zL, bend)
-            BPR = create_bending_point(CP_xR, CP_zR, bend)
-
-            # ---- FILTER: Is flange wide enough? ----
-            if not min_flange_width_filter(BPL=BPL, BPR=BPR):
-                continue
+            BPL = BP_table[(CP_xL_id, CP_zL_id)]
+            BPR = BP_table[(CP_xR_id, CP_zR_id)]
 
             # ---- Step 2: Calculate Flange Points perpendicular to bend line ----
             # FP extends from BP perpendicular to the bend line, toward each plane
@@ -250,17 +264,13 @@ def one_bend(segment, filter_cfg):
             # ---- FILTER: Check flange clearance ----
             # Verify that flange points are on the correct side of their respective planes
             # FPx should be on plane_x side, FPz should be on plane_z side
-            # Calculate which side of the bend axis each FP is on
-            dist_FPxL_to_plane_z = abs(np.dot(FPxL - plane_z.position, plane_z.orientation))
-            dist_FPxR_to_plane_z = abs(np.dot(FPxR - plane_z.position, plane_z.orientation))
-            dist_FPzL_to_plane_x = abs(np.dot(FPzL - plane_x.position, plane_x.orientation))
-            dist_FPzR_to_plane_x = abs(np.dot(FPzR - plane_x.position, plane_x.orientation))
-
+            # Distance of a point P to a plane is |P . n - offset| (offsets computed once above)
             # Flange points should maintain minimum clearance from opposite plane
             # This ensures the flange doesn't interfere with the opposite tab
-            min_clearance = min_flange_length * 0.5  # Allow 50% of flange length as minimum clearance
-            if (dist_FPxL_to_plane_z < min_clearance or dist_FPxR_to_plane_z < min_clearance or
-                dist_FPzL_to_plane_x < min_clearance or dist_FPzR_to_plane_x < min_clearance):
+            if (abs(np.dot(FPxL, normal_z) - offset_z) < min_clearance or
+                abs(np.dot(FPxR, normal_z) - offset_z) < min_clearance or
+                abs(np.dot(FPzL, normal_x) - offset_x) < min_clearance or
+                abs(np.dot(FPzR, normal_x) - offset_x) < min_clearance):
                 continue
 
             # ---- Determine L/R correspondence to avoid crossed connections ----
@@ -270,7 +280,7 @@ def one_bend(segment, filter_cfg):
 
             # Get bend line direction (from BPL to BPR)
             bend_vec = BPR - BPL
-            bend_len = np.linalg.norm(bend_vec)
+            bend_len = norm3(bend_vec)
 
             if bend_len > 1e-9:
                 bend_dir = bend_vec / bend_len
@@ -286,12 +296,12 @@ def one_bend(segment, filter_cfg):
                 fp_lines_cross = edge_z_proj < 0
             else:
                 # Bend points coincide - fall back to distance check
-                dist_xL_zL = np.linalg.norm(CP_xL - CP_zL)
-                dist_xL_zR = np.linalg.norm(CP_xL - CP_zR)
+                dist_xL_zL = norm3(CP_xL - CP_zL)
+                dist_xL_zR = norm3(CP_xL - CP_zR)
                 fp_lines_cross = dist_xL_zR < dist_xL_zL
 
             # ---- Update Segment.tabs ----
-            new_segment = segment.copy()
+            new_segment = segment.clone()
             new_tab_x = new_segment.tabs['tab_x']
             new_tab_z = new_segment.tabs['tab_z']
 
@@ -300,9 +310,9 @@ def one_bend(segment, filter_cfg):
             # CRITICAL: FP must use original corner coordinates, not calculated flange points
             # CRITICAL: Insert after the corner that comes LATER in the perimeter order
             # Perimeter flows: A → B → C → D → (back to A)
-            corner_order = list(new_tab_x.points.keys())
-            idx_L = corner_order.index(CP_xL_id)
-            idx_R = corner_order.index(CP_xR_id)
+            corner_order = new_tab_x.point_index
+            idx_L = corner_order[CP_xL_id]
+            idx_R = corner_order[CP_xR_id]
 
             # Check for wrap-around edge (D→A case: idx_L=3, idx_R=0 or idx_L=0, idx_R=3)
             is_wraparound = (idx_L == 3 and idx_R == 0) or (idx_L == 0 and idx_R == 3)
@@ -362,9 +372,9 @@ def one_bend(segment, filter_cfg):
             # CRITICAL: FP must use original corner coordinates
             # CRITICAL: Insert after the corner that comes LATER in perimeter order
             # CRITICAL: Handle crossing (when connection lines would cross)
-            corner_order_z = list(new_tab_z.points.keys())
-            idx_zL = corner_order_z.index(CP_zL_id)
-            idx_zR = corner_order_z.index(CP_zR_id)
+            corner_order_z = new_tab_z.point_index
+            idx_zL = corner_order_z[CP_zL_id]
+            idx_zR = corner_order_z[CP_zR_id]
 
             # Check for wrap-around edge
             is_wraparound_z = (idx_zL == 3 and idx_zR == 0) or (idx_zL == 0 and idx_zR == 3)
@@ -442,6 +452,26 @@ def one_bend(segment, filter_cfg):
     return segment_library
 
 
+def _outward_edge_directions(starts, ends, normal, center):
+    """
+    Midpoints and unit outward directions (in the tab plane, away from center) of all edges at once.
+
+    Args:
+        starts, ends: (N, 3) arrays with the start and end corner of each edge
+
+    Returns:
+        (mids, out_dirs, valid): (N, 3) midpoints, (N, 3) outward directions and a mask of the
+        non-degenerate edges; degenerate edges (parallel to the normal) get a zero direction.
+    """
+    mids = (starts + ends) / 2
+
+    out_dirs, lengths = normalize_rows(np.cross(ends - starts, normal))
+    valid = lengths >= 1e-9
+
+    # Flip the inward pointing ones with a sign multiply instead of a masked copy
+    out_dirs *= np.where(np.einsum('ij,ij->i', out_dirs, mids - center) < 0, -1.0, 1.0)[:, None]
+    return mids, out_dirs, valid
+
 def two_bends(segment, filter_cfg):
     """
     Generate double-bend connections between two tabs (A ↔ C) via intermediate plane B.
@@ -463,8 +493,13 @@ def two_bends(segment, filter_cfg):
     rect_x = tab_x.rectangle
     rect_z = tab_z.rectangle
 
-    plane_x = calculate_plane(rect_x)
-    plane_z = calculate_plane(rect_z)
+    plane_x = tab_x.plane
+    plane_z = tab_z.plane
+
+    # Filter switches, read once instead of once per candidate
+    check_min_bend_angle = filter_cfg.get('Min Bend Angle', True)
+    check_tabs_cover_rects = filter_cfg.get('Tabs cover Rects', False)
+    check_thin_segments = filter_cfg.get('Too thin segments', False)
 
     # Edge combinations for both rectangles
     rect_x_edges = [('A', 'B'), ('B', 'C'), ('C', 'D'), ('D', 'A'),
@@ -474,86 +509,97 @@ def two_bends(segment, filter_cfg):
 
     segment_library = []
 
+    # Corner coordinates are looked up once; the edge loops below only index these
+    corners_x = {k: tab_x.points[k] for k in ('A', 'B', 'C', 'D')}
+    corners_z = {k: tab_z.points[k] for k in ('A', 'B', 'C', 'D')}
+    # Same corners as (4, 3) arrays, plus the corner each forward edge (A->B, ..., D->A) ends at
+    corners_x_array = np.stack(list(corners_x.values()))
+    corners_z_array = np.stack(list(corners_z.values()))
+    next_x_array = np.roll(corners_x_array, -1, axis=0)
+    next_z_array = np.roll(corners_z_array, -1, axis=0)
+
     # Calculate centroids for direction checks
-    rect_x_corners = [tab_x.points[k] for k in ['A', 'B', 'C', 'D']]
-    rect_z_corners = [tab_z.points[k] for k in ['A', 'B', 'C', 'D']]
-    rect_x_center = np.mean(rect_x_corners, axis=0)
-    rect_z_center = np.mean(rect_z_corners, axis=0)
+    # (the sum * 0.25 gives the same result as np.mean)
+    rect_x_center = corners_x_array.sum(axis=0) * 0.25
+    rect_z_center = corners_z_array.sum(axis=0) * 0.25
+
+    # Midpoint and outward direction of every edge, shared by all approaches below. Reversing an
+    # edge changes neither, so they are computed for the four undirected edges (the first half of
+    # the edge lists) and repeated for the reversed half
+    mids_x4, out_dirs_x4, _ = _outward_edge_directions(corners_x_array, next_x_array, plane_x.orientation, rect_x_center)
+    mids_z4, out_dirs_z4, valid_z4 = _outward_edge_directions(corners_z_array, next_z_array, plane_z.orientation, rect_z_center)
+    mids_x, out_dirs_x = np.tile(mids_x4, (2, 1)), np.tile(out_dirs_x4, (2, 1))
+    mids_z, out_dirs_z, valid_z = np.tile(mids_z4, (2, 1)), np.tile(out_dirs_z4, (2, 1)), np.tile(valid_z4, 2)
+    edges_x = {pair_x: (corners_x[pair_x[0]], corners_x[pair_x[1]], mids_x[i], out_dirs_x[i])
+               for i, pair_x in enumerate(rect_x_edges)}
+    edges_z = {pair_z: (corners_z[pair_z[0]], corners_z[pair_z[1]], mids_z[i], out_dirs_z[i])
+               for i, pair_z in enumerate(rect_z_edges)}
 
     # ========== APPROACH 1: 90-DEGREE PERPENDICULAR PLANE B ==========
-    for pair_x in rect_x_edges:
+    # Calculate normal for intermediate plane B (perpendicular to both A and C)
+    # It only depends on the two planes, so parallel planes skip Approach 1 entirely
+    normal_B = cross3(plane_x.orientation, plane_z.orientation)
+    approach_1_edges_x = rect_x_edges if norm3(normal_B) >= 1e-6 else []
+    normal_B = normalize(normal_B)
+
+    # Plane B is perpendicular to a plane within 5 degrees if the angle between their normals
+    # is at least 85 degrees, i.e. |cos| < sin(5 deg); avoids an arccos per candidate
+    max_perp_cos = np.sin(np.radians(5))
+
+    if approach_1_edges_x:
+        # Connection vectors between all edge midpoints at once, [i, j] belongs to x edge i and z edge j.
+        # Only the 4 x 4 undirected edge pairs are evaluated, the reversed edges repeat them
+        connection_vecs = mids_z4[None, :, :] - mids_x4[:, None, :]
+        dists_along_normal_B = np.tile(np.dot(connection_vecs, normal_B), (2, 2))
+
+        # Check if edges are growing outward (toward each other)
+        x_growing = np.tile(np.einsum('ik,ijk->ij', out_dirs_x4, connection_vecs) > 0, (2, 2))
+        z_growing = np.tile(np.einsum('jk,ijk->ij', out_dirs_z4, -connection_vecs) > 0, (2, 2))
+        # Both would shrink for the other pairs, they are never looked at
+        any_growing = x_growing | z_growing
+
+        # Shift distances: the growing side also covers the offset along normal B
+        shift = np.abs(dists_along_normal_B) + min_flange_length
+        shift_x = np.where(x_growing, shift, min_flange_length)[..., None]
+        shift_z = np.where(x_growing, min_flange_length, shift)[..., None]
+
+        # Shifted bending points of all edge pairs at once, [i, j] as above
+        # (the reversed edges in the second half of the lists swap start and end)
+        starts_x = np.concatenate([corners_x_array, next_x_array])[:, None, :]
+        ends_x = np.concatenate([next_x_array, corners_x_array])[:, None, :]
+        starts_z = np.concatenate([corners_z_array, next_z_array])[None, :, :]
+        ends_z = np.concatenate([next_z_array, corners_z_array])[None, :, :]
+        BPsxL = starts_x + out_dirs_x[:, None, :] * shift_x
+        BPsxR = ends_x + out_dirs_x[:, None, :] * shift_x
+        BPszL = starts_z + out_dirs_z[None, :, :] * shift_z
+        BPszR = ends_z + out_dirs_z[None, :, :] * shift_z
+
+        # Check if plane B (through BPxL, BPxR, BPzL) is perpendicular to both A and C
+        # (within 5 degrees) on the unnormalized normals; a degenerate plane B passes like before
+        normals_y = np.cross(BPsxR - BPsxL, BPszL - BPsxL)
+        lengths_y = np.sqrt(np.einsum('ijk,ijk->ij', normals_y, normals_y))
+        max_dots = max_perp_cos * lengths_y
+        is_perp = ((np.abs(np.dot(normals_y, plane_x.orientation)) < max_dots)
+                   & (np.abs(np.dot(normals_y, plane_z.orientation)) < max_dots)) | (lengths_y < 1e-9)
+        # Non-perpendicular pairs are left to the fallback approach
+        approach_1_pairs = any_growing & is_perp
+
+    for i, pair_x in enumerate(approach_1_edges_x):
         CPxL_id, CPxR_id = pair_x
-        CPxL = tab_x.points[CPxL_id]
-        CPxR = tab_x.points[CPxR_id]
-        edge_x_vec = CPxR - CPxL
-        edge_x_mid = (CPxL + CPxR) / 2
+        CPxL, CPxR, edge_x_mid, out_dir_x = edges_x[pair_x]
 
-        for pair_z in rect_z_edges:
+        for j in np.flatnonzero(approach_1_pairs[i]):
+            pair_z = rect_z_edges[j]
             CPzL_id, CPzR_id = pair_z
-            CPzL = tab_z.points[CPzL_id]
-            CPzR = tab_z.points[CPzR_id]
-            edge_z_vec = CPzR - CPzL
-            edge_z_mid = (CPzL + CPzR) / 2
-
-            # Calculate normal for intermediate plane B (perpendicular to both A and C)
-            normal_B = np.cross(plane_x.orientation, plane_z.orientation)
-            if np.linalg.norm(normal_B) < 1e-6:
-                continue  # Planes are parallel, skip
-            normal_B = normalize(normal_B)
-
-            # Calculate outward directions for both edges
-            out_dir_x = np.cross(edge_x_vec, plane_x.orientation)
-            out_dir_x = normalize(out_dir_x)
-            if np.dot(out_dir_x, edge_x_mid - rect_x_center) < 0:
-                out_dir_x = -out_dir_x
-
-            out_dir_z = np.cross(edge_z_vec, plane_z.orientation)
-            out_dir_z = normalize(out_dir_z)
-            if np.dot(out_dir_z, edge_z_mid - rect_z_center) < 0:
-                out_dir_z = -out_dir_z
-
-            # Connection vector between edge midpoints
-            connection_vec = edge_z_mid - edge_x_mid
-            dist_along_normal_B = np.dot(connection_vec, normal_B)
-
-            # Check if edges are growing outward (toward each other)
-            is_x_growing = np.dot(out_dir_x, connection_vec) > 0
-            is_z_growing = np.dot(out_dir_z, -connection_vec) > 0
-
-            if not is_x_growing and not is_z_growing:
-                continue  # Both would shrink, skip
-
-            # Shift distances
-            if is_x_growing:
-                shift_dist_x = abs(dist_along_normal_B) + min_flange_length
-                shift_dist_z = min_flange_length
-            else:
-                shift_dist_x = min_flange_length
-                shift_dist_z = abs(dist_along_normal_B) + min_flange_length
+            CPzL, CPzR, edge_z_mid, out_dir_z = edges_z[pair_z]
 
-            # Shifted bending points
-            BPxL = CPxL + out_dir_x * shift_dist_x
-            BPxR = CPxR + out_dir_x * shift_dist_x
-            BPzL = CPzL + out_dir_z * shift_dist_z
-            BPzR = CPzR + out_dir_z * shift_dist_z
+            BPxL, BPxR = BPsxL[i, j], BPsxR[i, j]
+            BPzL, BPzR = BPszL[i, j], BPszR[i, j]
 
             # Create plane B from shifted points
             BP_triangle = {"A": BPxL, "B": BPxR, "C": BPzL}
             plane_y = calculate_plane(triangle=BP_triangle)
 
-            # Check if plane B is perpendicular to both A and C (within 5 degrees)
-            angle_tolerance = np.radians(5)
-            dot_BA = abs(np.dot(plane_y.orientation, plane_x.orientation))
-            angle_BA = np.arccos(np.clip(dot_BA, 0, 1))
-            is_perp_to_x = abs(angle_BA - np.pi / 2) < angle_tolerance
-
-            dot_BC = abs(np.dot(plane_y.orientation, plane_z.orientation))
-            angle_BC = np.arccos(np.clip(dot_BC, 0, 1))
-            is_perp_to_z = abs(angle_BC - np.pi / 2) < angle_tolerance
-
-            if not (is_perp_to_x and is_perp_to_z):
-                continue  # Not perpendicular, will try in fallback approach
-
             # ---- FILTER: Minimum flange width ----
             if not min_flange_width_filter(BPL=BPxL, BPR=BPxR):
                 continue
@@ -561,7 +607,7 @@ def two_bends(segment, filter_cfg):
                 continue
 
             # ---- FILTER: Minimum bend angle ----
-            if filter_cfg.get('Min Bend Angle', True):
+            if check_min_bend_angle:
                 if not minimum_angle_filter(plane_x, plane_y):
                     continue
                 if not minimum_angle_filter(plane_y, plane_z):
@@ -581,8 +627,8 @@ def two_bends(segment, filter_cfg):
                 continue
 
             # Correct point ordering to prevent crossovers
-            dist_xL_zL = np.linalg.norm(BPxL - BPzL)
-            dist_xL_zR = np.linalg.norm(BPxL - BPzR)
+            dist_xL_zL = norm3(BPxL - BPzL)
+            dist_xL_zR = norm3(BPxL - BPzR)
             z_swapped = dist_xL_zR < dist_xL_zL
             if z_swapped:
                 BPzL, BPzR = BPzR, BPzL
@@ -592,7 +638,7 @@ def two_bends(segment, filter_cfg):
                 CPzL, CPzR = CPzR, CPzL
 
             # Create new segment
-            new_segment = segment.copy()
+            new_segment = segment.clone()
             new_tab_x = new_segment.tabs['tab_x']
             new_tab_z = new_segment.tabs['tab_z']
 
@@ -602,9 +648,9 @@ def two_bends(segment, filter_cfg):
             # Insert points in Tab x (with flange)
             # Use corner points for FP to ensure proper connection to original tab
             # CRITICAL: Insert after the corner that comes LATER in the perimeter order
-            corner_order_x = list(new_tab_x.points.keys())
-            idx_xL = corner_order_x.index(CPxL_id)
-            idx_xR = corner_order_x.index(CPxR_id)
+            corner_order_x = new_tab_x.point_index
+            idx_xL = corner_order_x[CPxL_id]
+            idx_xR = corner_order_x[CPxR_id]
 
             # Check for wrap-around edge
             is_wraparound_x = (idx_xL == 3 and idx_xR == 0) or (idx_xL == 0 and idx_xR == 3)
@@ -690,9 +736,9 @@ def two_bends(segment, filter_cfg):
             orig_CPzL_id = CPzR_id if z_swapped else CPzL_id
             orig_CPzR_id = CPzL_id if z_swapped else CPzR_id
 
-            corner_order_z = list(new_tab_z.points.keys())
-            idx_zL = corner_order_z.index(orig_CPzL_id)
-            idx_zR = corner_order_z.index(orig_CPzR_id)
+            corner_order_z = new_tab_z.point_index
+            idx_zL = corner_order_z[orig_CPzL_id]
+            idx_zR = corner_order_z[orig_CPzR_id]
 
             # Check for wrap-around edge (using original indices)
             is_wraparound_z_90 = (idx_zL == 3 and idx_zR == 0) or (idx_zL == 0 and idx_zR == 3)
@@ -749,37 +795,31 @@ def two_bends(segment, filter_cfg):
             segment_library.append(new_segment)
 
     # ========== APPROACH 2A: CORNER CONNECTION (NON-PARALLEL, WITH CORNER REMOVAL) ==========
+    rect_z_ids = list(rect_z.points.keys())
+
     for pair_x in rect_x_edges:
         CPxL_id = pair_x[0]
         CPxR_id = pair_x[1]
-        CPxL = tab_x.points[CPxL_id]
-        CPxR = tab_x.points[CPxR_id]
-
-        # Calculate outward direction for tab_x
-        edge_x_vec = CPxR - CPxL
-        edge_x_mid = (CPxL + CPxR) / 2
-        out_dir_x = np.cross(edge_x_vec, plane_x.orientation)
-        out_dir_x = normalize(out_dir_x)
-        if np.dot(out_dir_x, edge_x_mid - rect_x_center) < 0:
-            out_dir_x = -out_dir_x
+        CPxL, CPxR, edge_x_mid, out_dir_x = edges_x[pair_x]
 
         # Shift tab_x edge outward to create flange
         BPxL = CPxL + out_dir_x * min_flange_length
         BPxR = CPxR + out_dir_x * min_flange_length
 
+        # ---- FILTER: Is flange wide enough? ----
+        # Only depends on the x edge, so checked once before the corner loop
+        if not min_flange_width_filter(BPL=BPxL, BPR=BPxR):
+            continue
+
         # Iterate over corners for projection-based connection
-        for i, CPzM_id in enumerate(rect_z.points):
+        for i, CPzM_id in enumerate(rect_z_ids):
             CPzM = rect_z.points[CPzM_id]
-            CPzL_id = list(rect_z.points.keys())[(i - 1) % 4]
-            CPzR_id = list(rect_z.points.keys())[(i + 1) % 4]
+            CPzL_id = rect_z_ids[(i - 1) % 4]
+            CPzR_id = rect_z_ids[(i + 1) % 4]
             CPzL = rect_z.points[CPzL_id]
             CPzR = rect_z.points[CPzR_id]
 
-            # ---- FILTER: Is flange wide enough? ----
-            if not min_flange_width_filter(BPL=BPxL, BPR=BPxR):
-                continue
-
-            new_segment = segment.copy()
+            new_segment = segment.clone()
             new_tab_x = new_segment.tabs['tab_x']
             new_tab_z = new_segment.tabs['tab_z']
 
@@ -790,7 +830,7 @@ def two_bends(segment, filter_cfg):
 
             if projection_point is not None:
                 vec_PP_CP = CPzM - projection_point
-                c = np.linalg.norm(vec_PP_CP)
+                c = norm3(vec_PP_CP)
                 a = min_flange_length
 
                 if c <= a:
@@ -801,8 +841,8 @@ def two_bends(segment, filter_cfg):
                     h = np.sqrt(max(0, b ** 2 - d ** 2))
 
                     u = vec_PP_CP / c
-                    v = np.cross(u, plane_z.orientation)
-                    v_norm = np.linalg.norm(v)
+                    v = cross3(u, plane_z.orientation)
+                    v_norm = norm3(v)
                     if v_norm > 1e-9:
                         v /= v_norm
                     else:
@@ -811,13 +851,13 @@ def two_bends(segment, filter_cfg):
                     sol1 = projection_point + d * u + h * v
                     sol2 = projection_point + d * u - h * v
 
-                    if np.linalg.norm(sol1 - rect_z_center) >= np.linalg.norm(sol2 - rect_z_center):
+                    if norm3(sol1 - rect_z_center) >= norm3(sol2 - rect_z_center):
                         BPzM = sol1
                     else:
                         BPzM = sol2
 
                     bend_yz_ori = BPzM - projection_point
-                    bend_yz_ori_norm = np.linalg.norm(bend_yz_ori)
+                    bend_yz_ori_norm = norm3(bend_yz_ori)
                     if bend_yz_ori_norm > 1e-9:
                         bend_yz_ori /= bend_yz_ori_norm
                     bend_yz = Bend(position=projection_point, orientation=bend_yz_ori)
@@ -828,8 +868,7 @@ def two_bends(segment, filter_cfg):
                 # Skip parallel case - handled in Approach 2B
                 continue
 
-            BPzL = project_onto_line(CPzL, bend_yz.position, bend_yz.orientation)
-            BPzR = project_onto_line(CPzR, bend_yz.position, bend_yz.orientation)
+            BPzL, BPzR = project_onto_line(np.array([CPzL, CPzR]), bend_yz.position, bend_yz.orientation)
 
             BP_triangle = {"A": BPxL, "B": BPxR, "C": BPzM}
             plane_y = calculate_plane(triangle=BP_triangle)
@@ -838,7 +877,7 @@ def two_bends(segment, filter_cfg):
             new_tab_y = Tab(tab_id=tab_y_id, points=BP_triangle)
 
             # ---- FILTER: Minimum bend angle ----
-            if filter_cfg.get('Min Bend Angle', True):
+            if check_min_bend_angle:
                 if not minimum_angle_filter(plane_x, plane_y):
                     continue
                 if not minimum_angle_filter(plane_y, plane_z):
@@ -864,9 +903,9 @@ def two_bends(segment, filter_cfg):
             # Insert points in Tab x (with flange)
             # Use corner points for FP to ensure proper connection
             # CRITICAL: Insert after the corner that comes LATER in the perimeter order
-            corner_order_x_fb = list(new_tab_x.points.keys())
-            idx_xL_fb = corner_order_x_fb.index(CPxL_id)
-            idx_xR_fb = corner_order_x_fb.index(CPxR_id)
+            corner_order_x_fb = new_tab_x.point_index
+            idx_xL_fb = corner_order_x_fb[CPxL_id]
+            idx_xR_fb = corner_order_x_fb[CPxR_id]
 
             # Check for wrap-around edge
             is_wraparound_x_fb = (idx_xL_fb == 3 and idx_xR_fb == 0) or (idx_xL_fb == 0 and idx_xR_fb == 3)
@@ -949,11 +988,11 @@ def two_bends(segment, filter_cfg):
             # Insert points in Tab z - use calculated FP (FPzyL, FPzyR in tab_z's plane)
             # CRITICAL: Insert after the corner that comes LATER in the perimeter order
             # CRITICAL: Handle crossing (when connection lines would cross)
-            corner_order_z_fb = list(new_tab_z.points.keys())
+            corner_order_z_fb = new_tab_z.point_index
 
             # Determine base point ordering based on perimeter flow
-            idx_zL_fb = corner_order_z_fb.index(CPzL_id)
-            idx_zR_fb = corner_order_z_fb.index(CPzR_id)
+            idx_zL_fb = corner_order_z_fb[CPzL_id]
+            idx_zR_fb = corner_order_z_fb[CPzR_id]
 
             # Check for wrap-around edge
             # Wrap-around occurs when indices are not adjacent (gap > 1)
@@ -1017,14 +1056,14 @@ def two_bends(segment, filter_cfg):
             new_tab_z.insert_points(L={insert_z_id: insert_z_val}, add_points=bend_points_z)
 
             # ---- FILTER: Do Tabs cover Rects fully? ----
-            if filter_cfg.get('Tabs cover Rects', False):
+            if check_tabs_cover_rects:
                 if not tab_fully_contains_rectangle(new_tab_x, rect_x):
                     continue
                 if not tab_fully_contains_rectangle(new_tab_z, rect_z):
                     continue
 
             # ---- FILTER: Thin segments ----
-            if filter_cfg.get('Too thin segments', False):
+            if check_thin_segments:
                 if thin_segment_filter(new_segment):
                     continue
 
@@ -1036,66 +1075,55 @@ def two_bends(segment, filter_cfg):
             segment_library.append(new_segment)
 
     # ========== APPROACH 2B: EDGE CONNECTION (PARALLEL CASE, NO CORNER REMOVAL) ==========
+    # The second bend sits on the z edge shifted outward by the flange length, which does not
+    # depend on the x edge (None for degenerate edges, parallel to the plane normal)
+    bend_yz_positions_z = mids_z + out_dirs_z * min_flange_length
+    bend_yz_positions = {pair_z: bend_yz_positions_z[i] if valid_z[i] else None
+                         for i, pair_z in enumerate(rect_z_edges)}
+
     for pair_x in rect_x_edges:
         CPxL_id = pair_x[0]
         CPxR_id = pair_x[1]
-        CPxL = tab_x.points[CPxL_id]
-        CPxR = tab_x.points[CPxR_id]
-
-        # Calculate outward direction for tab_x
-        edge_x_vec = CPxR - CPxL
-        edge_x_mid = (CPxL + CPxR) / 2
-        out_dir_x = np.cross(edge_x_vec, plane_x.orientation)
-        out_dir_x = normalize(out_dir_x)
-        if np.dot(out_dir_x, edge_x_mid - rect_x_center) < 0:
-            out_dir_x = -out_dir_x
+        CPxL, CPxR, edge_x_mid, out_dir_x = edges_x[pair_x]
 
         # Shift tab_x edge outward to create flange
         BPxL = CPxL + out_dir_x * min_flange_length
         BPxR = CPxR + out_dir_x * min_flange_length
 
+        # ---- FILTER: Is flange wide enough? ----
+        # Only depends on the x edge, so checked once before the edge loop
+        if not min_flange_width_filter(BPL=BPxL, BPR=BPxR):
+            continue
+
+        bend_xy = Bend(position=BPxL, orientation=BPxR - BPxL, BPL=BPxL, BPR=BPxR)
+
+        # Verify bend_xy orientation is not parallel to plane_z (sanity check)
+        ortho_check = cross3(bend_xy.orientation, plane_z.orientation)
+        if norm3(ortho_check) < 1e-9:
+            # Bend is parallel to plane_z - skip (not the parallel case we want)
+            continue
+
+        # Second bends run parallel to the first one, project_onto_line needs a unit direction
+        bend_yz_ori = bend_xy.orientation / norm3(bend_xy.orientation)
+
         # Iterate over edges for parallel connection
         for pair_z in rect_z_edges:
-            CPzL_id, CPzR_id = pair_z
-            CPzL = tab_z.points[CPzL_id]
-            CPzR = tab_z.points[CPzR_id]
-
-            # ---- FILTER: Is flange wide enough? ----
-            if not min_flange_width_filter(BPL=BPxL, BPR=BPxR):
+            bend_yz_pos = bend_yz_positions[pair_z]
+            if bend_yz_pos is None:
                 continue
+            CPzL_id, CPzR_id = pair_z
+            CPzL = corners_z[CPzL_id]
+            CPzR = corners_z[CPzR_id]
 
-            new_segment = segment.copy()
+            new_segment = segment.clone()
             new_tab_x = new_segment.tabs['tab_x']
             new_tab_z = new_segment.tabs['tab_z']
 
-            bend_xy = Bend(position=BPxL, orientation=BPxR - BPxL, BPL=BPxL, BPR=BPxR)
-
-            # Calculate outward direction for tab_z edge
-            edge_z_vec = CPzR - CPzL
-            edge_z_mid = (CPzL + CPzR) / 2
-            out_dir_z = np.cross(edge_z_vec, plane_z.orientation)
-            out_dir_z_norm = np.linalg.norm(out_dir_z)
-            if out_dir_z_norm < 1e-9:
-                # Edge is parallel to plane normal - skip
-                continue
-            out_dir_z = out_dir_z / out_dir_z_norm
-            if np.dot(out_dir_z, edge_z_mid - rect_z_center) < 0:
-                out_dir_z = -out_dir_z
-
-            # Verify bend_xy orientation is not parallel to plane_z (sanity check)
-            ortho_check = np.cross(bend_xy.orientation, plane_z.orientation)
-            if np.linalg.norm(ortho_check) < 1e-9:
-                # Bend is parallel to plane_z - skip (not the parallel case we want)
-                continue
-
             # Create second bend parallel to first bend, offset by outward direction
-            bend_yz_pos = edge_z_mid + out_dir_z * min_flange_length
-            bend_yz_ori = bend_xy.orientation / np.linalg.norm(bend_xy.orientation)
             bend_yz = Bend(position=bend_yz_pos, orientation=bend_yz_ori)
 
             # Project corners onto bend axis
-            BPzL = project_onto_line(CPzL, bend_yz.position, bend_yz.orientation)
-            BPzR = project_onto_line(CPzR, bend_yz.position, bend_yz.orientation)
+            BPzL, BPzR = project_onto_line(np.array([CPzL, CPzR]), bend_yz.position, bend_yz.orientation)
 
             # ---- FILTER: Is flange wide enough? ----
             if not min_flange_width_filter(BPL=BPzL, BPR=BPzR):
@@ -1110,7 +1138,7 @@ def two_bends(segment, filter_cfg):
             new_tab_y = Tab(tab_id=tab_y_id, points=BP_triangle)
 
             # ---- FILTER: Minimum bend angle ----
-            if filter_cfg.get('Min Bend Angle', True):
+            if check_min_bend_angle:
                 if not minimum_angle_filter(plane_x, plane_y):
                     continue
                 if not minimum_angle_filter(plane_y, plane_z):
@@ -1130,9 +1158,9 @@ def two_bends(segment, filter_cfg):
                 continue
 
             # Insert points in Tab x - same logic as Approach 1
-            corner_order_x_fb = list(new_tab_x.points.keys())
-            idx_xL_fb = corner_order_x_fb.index(CPxL_id)
-            idx_xR_fb = corner_order_x_fb.index(CPxR_id)
+            corner_order_x_fb = new_tab_x.point_index
+            idx_xL_fb = corner_order_x_fb[CPxL_id]
+            idx_xR_fb = corner_order_x_fb[CPxR_id]
 
             is_wraparound_x_fb = (idx_xL_fb == 3 and idx_xR_fb == 0) or (idx_xL_fb == 0 and idx_xR_fb == 3)
 
@@ -1203,9 +1231,9 @@ def two_bends(segment, filter_cfg):
             new_tab_y.points = bend_points_y
 
             # Insert points in Tab z - same logic as Approach 1
-            corner_order_z_fb = list(new_tab_z.points.keys())
-            idx_zL_fb = corner_order_z_fb.index(CPzL_id)
-            idx_zR_fb = corner_order_z_fb.index(CPzR_id)
+            corner_order_z_fb = new_tab_z.point_index
+            idx_zL_fb = corner_order_z_fb[CPzL_id]
+            idx_zR_fb = corner_order_z_fb[CPzR_id]
 
             is_wraparound_z_fb = abs(idx_zL_fb - idx_zR_fb) > 1
 
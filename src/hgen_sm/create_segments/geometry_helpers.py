@@ -4,7 +4,7 @@ from types import SimpleNamespace
 from typing import Any, Dict
 
 
-from src.hgen_sm.create_segments.utils import normalize, perp_toward_plane, closest_points_between_lines
+from src.hgen_sm.create_segments.utils import normalize, norm3, cross3, perp_toward_plane, closest_points_between_lines
 from config.design_rules import min_flange_length
 
 
@@ -28,7 +28,7 @@ def calculate_plane(rect = None, triangle = None):
     # Compute normal vector
     AB = B - A
     AC = C - A
-    normal = normalize(np.cross(AB, AC))
+    normal = normalize(cross3(AB, AC))
 
     # Compute centroid (plane position)
     position = (A + C) / 2
@@ -41,13 +41,20 @@ def calculate_plane_intersection(planeA, planeB):
     n1, n2 = planeA.orientation, planeB.orientation
     p01, p02 = planeA.position, planeB.position
 
-    orientation = np.cross(n1, n2)
-    orientation = normalize(orientation)
-    
-    A = np.vstack([n1, n2, orientation])
-    b = np.array([np.dot(n1, p01), np.dot(n2, p02), 0.0])
+    direction = cross3(n1, n2)
+    orientation = normalize(direction)
+    d1, d2 = np.dot(n1, p01), np.dot(n2, p02)
 
-    position = np.linalg.lstsq(A, b, rcond=None)[0]
+    # Point of the line closest to the origin, i.e. the solution of
+    # [n1; n2; orientation] @ x = [d1, d2, 0], in closed form instead of a least-squares solve
+    direction_sq = np.dot(direction, direction)
+    if direction_sq > 1e-18:
+        position = cross3(d1 * n2 - d2 * n1, direction) / direction_sq
+    else:
+        # Parallel planes: keep the minimum-norm least-squares solution
+        A = np.vstack([n1, n2, orientation])
+        b = np.array([d1, d2, 0.0])
+        position = np.linalg.lstsq(A, b, rcond=None)[0]
 
     intersection = {
         "position": position,
@@ -64,7 +71,7 @@ def create_bending_point(point_tab_A, point_tab_B, bendAB):
     p0 = point_tab_A
     p1 = point_tab_B
     dir_AB = p1 - p0
-    if np.linalg.norm(dir_AB) < 1e-9:
+    if norm3(dir_AB) < 1e-9:
         vec = p0 - bend_position
         t = np.dot(vec, bend_orientation)
         BP = bend_position + t * bend_orientation
@@ -77,6 +84,48 @@ def create_bending_point(point_tab_A, point_tab_B, bendAB):
         
     return BP
 
+def create_bending_points(points_tab_A, points_tab_B, bendAB):
+    """
+    Vectorized create_bending_point for many corner pairs at once.
+
+    Args:
+        points_tab_A: (N, 3) array of corner points on the first tab
+        points_tab_B: (N, 3) array of corner points on the second tab
+        bendAB: Bend with position and orientation of the bend line
+
+    Returns:
+        (N, 3) array of bending points, row i belonging to pair i
+    """
+    P0 = np.asarray(points_tab_A, dtype=np.float64)
+    P1 = np.asarray(points_tab_B, dtype=np.float64)
+    bend_position = bendAB.position
+    bend_orientation = bendAB.orientation
+
+    dir_AB = P1 - P0
+    len_AB = np.linalg.norm(dir_AB, axis=1)
+    coincident = len_AB < 1e-9
+
+    # Closest point on the bend line to each line P0 -> P1 (see closest_points_between_lines)
+    d1 = normalize(bend_orientation)
+    d2 = dir_AB / np.where(coincident, 1.0, len_AB)[:, None]
+    r = bend_position - P0
+    a = np.dot(d1, d1)
+    b = np.dot(d2, d1)
+    c = np.einsum('ij,ij->i', d2, d2)
+    e = np.dot(r, d1)
+    f = np.einsum('ij,ij->i', d2, r)
+    denom = a * c - b * b
+    parallel = np.abs(denom) < 1e-9
+    t = np.where(parallel, 0.0, (b * f - c * e) / np.where(parallel, 1.0, denom))
+    BP = bend_position + t[:, None] * d1
+
+    # Coincident corners: project the corner straight onto the bend line
+    if np.any(coincident):
+        t_proj = np.dot(P0[coincident] - bend_position, bend_orientation)
+        BP[coincident] = bend_position + t_proj[:, None] * bend_orientation
+
+    return BP
+
 def calculate_flange_points(BP1, BP2, planeA, planeB, flange_length=min_flange_length):
     """Output: FPAL, FPAR, FPBL, FPBR"""
     BP0 = (BP1 + BP2) / 2.0
@@ -1,3 +1,5 @@
+import math
+
 import numpy as np
 
 def convert_to_float64(items):
@@ -11,12 +13,33 @@ def convert_to_float64(items):
         converted.append(new_item)
     return converted
 
+def norm3(v):
+    """Length of a single 3D vector (avoids np.linalg.norm's axis/ord dispatch)."""
+    return math.sqrt(np.dot(v, v))
+
+def cross3(a, b):
+    """Cross product of two 3D vectors, written out to skip np.cross's broadcasting setup."""
+    return np.array([a[1] * b[2] - a[2] * b[1],
+                     a[2] * b[0] - a[0] * b[2],
+                     a[0] * b[1] - a[1] * b[0]])
+
 def normalize(v):
-    n = np.linalg.norm(v)
+    n = norm3(v)
     if n < 1e-9:
         return np.zeros_like(v)
     return v / n
 
+def normalize_rows(v):
+    """
+    Row-wise normalize for an (N, 3) array, the batched form of normalize.
+
+    Returns (unit, lengths); rows shorter than 1e-9 come back as zero vectors, like in normalize.
+    """
+    lengths = np.sqrt(np.einsum('ij,ij->i', v, v))
+    valid = lengths >= 1e-9
+    unit = np.where(valid[:, None], v / np.where(valid, lengths, 1.0)[:, None], 0.0)
+    return unit, lengths
+
 def closest_points_between_lines(p1, d1, p2, d2):
     d1 = normalize(d1)
     d2 = normalize(d2)
@@ -43,11 +66,11 @@ def closest_points_between_lines(p1, d1, p2, d2):
 def perp_toward_plane(plane, BP0, bend_dir):
     n = plane.orientation
     # bend_dir = plane.orientation
-    perp = np.cross(n, bend_dir)
-    if np.linalg.norm(perp) < 1e-9:
-        perp = np.cross(bend_dir, np.array([1,0,0]))
-        if np.linalg.norm(perp) < 1e-9:
-            perp = np.cross(bend_dir, np.array([0,1,0]))
+    perp = cross3(n, bend_dir)
+    if norm3(perp) < 1e-9:
+        perp = cross3(bend_dir, np.array([1,0,0]))
+        if norm3(perp) < 1e-9:
+            perp = cross3(bend_dir, np.array([0,1,0]))
     perp = normalize(perp)
     sign = np.sign(np.dot(plane.position - BP0, perp))
     if sign == 0:
@@ -91,4 +114,5 @@ def line_plane_intersection(
     return intersection_point
 
 def project_onto_line(pt, line_pos, line_ori):
-                return line_pos + np.dot(pt - line_pos, line_ori) * line_ori
\ No newline at end of file
+    """Project a point, or an (N, 3) array of points, onto a line. line_ori must be a unit vector."""
+    return line_pos + np.dot(pt - line_pos, line_ori)[..., None] * line_ori
\ No newline at end of file
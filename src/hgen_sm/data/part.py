@@ -17,6 +17,29 @@ class Part:
     def copy(self):
         return copy.deepcopy(self)
 
+    def clone(self):
+        """Cheap copy for the assembly loop, tabs are copied with Tab.clone()."""
+        new_part = Part.__new__(Part)
+        new_part.__dict__.update(self.__dict__)
+        if self.tabs is not None:
+            new_part.tabs = {tab_id: tab.clone() for tab_id, tab in self.tabs.items()}
+        new_part.bends = dict(self.bends)
+        return new_part
+
+    def cow_copy(self):
+        """
+        Copy that shares the Tab objects with this part (copy-on-write).
+
+        Only valid while tabs are replaced in the copy's tabs dict, never modified in place,
+        which is how part_assembly builds its result.
+        """
+        new_part = Part.__new__(Part)
+        new_part.__dict__.update(self.__dict__)
+        if self.tabs is not None:
+            new_part.tabs = dict(self.tabs)
+        new_part.bends = dict(self.bends)
+        return new_part
+
 
     def __repr__(self):
 
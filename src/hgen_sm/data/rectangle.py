@@ -19,6 +19,8 @@ class Rectangle:
             'D': np.array(D, dtype=np.float64), 
             }
         # self.corners = [self.A, self.B, self.C, self.D]
+        # Corners A-D as one (4, 3) array, for vectorized distance checks
+        self.corners_array = np.stack([self.points[k] for k in ('A', 'B', 'C', 'D')])
         self.mounts = mounts
 
     def __repr__(self):
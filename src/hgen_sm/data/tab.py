@@ -1,10 +1,17 @@
 import copy
+import functools
 import numpy as np
 from typing import Dict, Optional
 
 from .rectangle import Rectangle
 from .bend import Bend
 
+# Point type tags, see Tab.point_types
+CORNER_POINT = 0   # A, B, C, D
+FLANGE_POINT = 1   # FP...
+BEND_POINT = 2     # BP...
+OTHER_POINT = 3
+
 
 class Tab:
     """Represents a single, planar section of the SM part"""
@@ -27,6 +34,88 @@ class Tab:
         self.bends: list['Bend'] = []
         # self.corner_usage: Dict[str, Optional[str]] = {'A': None, 'B': None, 'C': None, 'D': None}
 
+    @property
+    def points(self) -> Dict[str, np.ndarray]:
+        return self._points
+
+    @points.setter
+    def points(self, points):
+        # Every change of the perimeter goes through here, so the array view is rebuilt lazily
+        self._points = points
+        self._points_array = None
+        self._point_index = None
+        self._point_names = None
+        self._point_types = None
+        self._bounds = None
+
+    @property
+    def points_array(self) -> np.ndarray:
+        """
+        Read-only (N, 3) float64 array of all perimeter points, in the order of self.points.
+
+        Built on first access and cached until self.points is reassigned. Do not mutate
+        self.points in place, assign a new dict instead (as insert_points/remove_point do).
+        """
+        if self._points_array is None:
+            if self._points:
+                array = np.array(list(self._points.values()), dtype=np.float64)
+            else:
+                array = np.empty((0, 3), dtype=np.float64)
+            array.setflags(write=False)
+            self._points_array = array
+        return self._points_array
+
+    @functools.cached_property
+    def plane(self):
+        """Plane (position, orientation) of the tab's rectangle, computed on first access."""
+        # Imported here: create_segments itself imports from the data package
+        from src.hgen_sm.create_segments.geometry_helpers import calculate_plane
+        return calculate_plane(self.rectangle)
+
+    @property
+    def point_index(self) -> Dict[str, int]:
+        """Position of each point name in the perimeter (= row in points_array), cached like points_array."""
+        if self._point_index is None:
+            self._point_index = {name: i for i, name in enumerate(self._points)} if self._points else {}
+        return self._point_index
+
+    @property
+    def point_names(self) -> tuple:
+        """Names of the perimeter points, row i of points_array belongs to point_names[i]. Cached like points_array."""
+        if self._point_names is None:
+            self._point_names = tuple(self._points) if self._points else ()
+        return self._point_names
+
+    @property
+    def point_types(self) -> np.ndarray:
+        """
+        Read-only int8 array with the type of each perimeter point (CORNER_POINT, FLANGE_POINT,
+        BEND_POINT or OTHER_POINT), aligned with points_array and cached like it.
+        """
+        if self._point_types is None:
+            types = np.array([_point_type(name) for name in self._points] if self._points else [], dtype=np.int8)
+            types.setflags(write=False)
+            self._point_types = types
+        return self._point_types
+
+    @property
+    def bounds(self):
+        """(min, max) corners of the axis-aligned bounding box of the points, cached like points_array."""
+        if self._bounds is None:
+            array = self.points_array
+            self._bounds = (array.min(axis=0), array.max(axis=0))
+        return self._bounds
+
+    def __getstate__(self):
+        # The cached array, index, names, types and bounds are derived data, leave them out of copies and pickles
+        state = self.__dict__.copy()
+        state['_points_array'] = None
+        state['_point_index'] = None
+        state['_point_names'] = None
+        state['_point_types'] = None
+        state['_bounds'] = None
+        return state
+
     def __repr__(self):
         repr_str = f"<Tab: "
 
@@ -77,6 +166,19 @@ class Tab:
 
     def copy(self):
         return copy.deepcopy(self)
+
+    def clone(self):
+        """
+        Cheap copy for the assembly loop: the points dict (and the lists of mounts and bends)
+        are copied. The point arrays, rectangle and mount/bend objects are shared, since neither
+        segment creation nor assembly modifies them in place; they only assign new points dicts.
+        """
+        new_tab = Tab.__new__(Tab)
+        new_tab.__dict__.update(self.__dict__)
+        new_tab.points = dict(self._points) if self._points else self._points
+        new_tab.mounts = list(self.mounts)
+        new_tab.bends = list(self.bends)
+        return new_tab
     
     def insert_points(self, L, add_points):
         """
@@ -127,4 +229,14 @@ class Tab:
             if key != point_id:
                 new_points[key] = value
                 
-        self.points = new_points
\ No newline at end of file
+        self.points = new_points
+
+
+def _point_type(name: str) -> int:
+    if name in ('A', 'B', 'C', 'D'):
+        return CORNER_POINT
+    if name.startswith('FP'):
+        return FLANGE_POINT
+    if name.startswith('BP'):
+        return BEND_POINT
+    return OTHER_POINT
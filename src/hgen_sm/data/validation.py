@@ -7,9 +7,14 @@ These functions help catch topology and geometry errors early in the pipeline.
 import numpy as np
 import re
 from typing import Dict, List, Tuple, Optional
-from .tab import Tab
+from .tab import Tab, FLANGE_POINT
 from .part import Part
 
+# Pattern for bend/flange points: (FP|BP) + tab_ids + (L|R)
+# Tab IDs can be: single digit (0), multi-digit (01), or composite (0_1, 01_02)
+# Must have underscore separator between tab IDs
+POINT_NAME_PATTERN = re.compile(r'^(FP|BP)(\d+(?:_\d+)+)(L|R)$')
+
 
 def validate_flange_points(tab: Tab, tolerance: float = 1e-6) -> Tuple[bool, List[str]]:
     """
@@ -34,43 +39,30 @@ def validate_flange_points(tab: Tab, tolerance: float = 1e-6) -> Tuple[bool, Lis
         # Intermediate tabs (from two-bend) don't have rectangles, skip validation
         return True, []
 
-    corner_coords = {
-        'A': tab.rectangle.points['A'],
-        'B': tab.rectangle.points['B'],
-        'C': tab.rectangle.points['C'],
-        'D': tab.rectangle.points['D']
-    }
-
-    # Check all FP points in the tab
-    for point_id, coords in tab.points.items():
-        if point_id.startswith('FP'):
-            # Extract which corner this FP should correspond to
-            # FP format: "FP<tabID><L|R>" or "FP<tabID1>_<tabID2><L|R>"
-            # The last character is L or R, which indicates left or right corner
-
-            # Find if this FP matches any corner coordinate
-            matches_corner = False
-            matching_corner = None
-
-            for corner_id, corner_coord in corner_coords.items():
-                distance = np.linalg.norm(coords - corner_coord)
-                if distance < tolerance:
-                    matches_corner = True
-                    matching_corner = corner_id
-                    break
-
-            if not matches_corner:
-                # Find nearest corner for error message
-                nearest_corner = min(
-                    corner_coords.items(),
-                    key=lambda item: np.linalg.norm(coords - item[1])
-                )
-                nearest_dist = np.linalg.norm(coords - nearest_corner[1])
+    fp_rows = np.flatnonzero(tab.point_types == FLANGE_POINT)
+    if len(fp_rows) == 0:
+        return True, []
 
-                errors.append(
-                    f"Tab {tab.tab_id}: FP '{point_id}' at {coords} does not match "
-                    f"any corner coordinate (nearest: {nearest_corner[0]} at distance {nearest_dist:.6f})"
-                )
+    # Distances of all FP points to all corners in one go: row i belongs to fp_ids[i]
+    # FP format: "FP<tabID><L|R>" or "FP<tabID1>_<tabID2><L|R>"
+    corner_ids = ['A', 'B', 'C', 'D']
+    point_names = tab.point_names
+    fp_ids = [point_names[row] for row in fp_rows]
+    fp_array = tab.points_array[fp_rows]
+    corner_array = tab.rectangle.corners_array
+    distances = np.linalg.norm(fp_array[:, None, :] - corner_array[None, :, :], axis=2)
+
+    for point_id, fp_distances in zip(fp_ids, distances):
+        # Find if this FP matches any corner coordinate
+        if np.any(fp_distances < tolerance):
+            continue
+
+        # Find nearest corner for error message
+        nearest = int(np.argmin(fp_distances))
+        errors.append(
+            f"Tab {tab.tab_id}: FP '{point_id}' at {tab.points[point_id]} does not match "
+            f"any corner coordinate (nearest: {corner_ids[nearest]} at distance {fp_distances[nearest]:.6f})"
+        )
 
     return len(errors) == 0, errors
 
@@ -95,8 +87,7 @@ def validate_perimeter_ordering(tab: Tab) -> Tuple[bool, List[str]]:
         errors.append(f"Tab {tab.tab_id}: No points defined")
         return False, errors
 
-    points_list = list(tab.points.values())
-    num_points = len(points_list)
+    num_points = len(tab.point_names)
 
     if num_points < 3:
         errors.append(f"Tab {tab.tab_id}: Too few points ({num_points}) to form a perimeter")
@@ -107,7 +98,7 @@ def validate_perimeter_ordering(tab: Tab) -> Tuple[bool, List[str]]:
     # This is correct topology: Corner → FP (at corner) → BP (shifted)
     # So we skip duplicate detection for FP-corner pairs
     tolerance = 1e-6
-    point_ids = list(tab.points.keys())
+    point_ids = tab.point_names
 
     def is_expected_duplicate(id1, id2):
         """Check if two point IDs are expected to be at same location."""
@@ -119,60 +110,50 @@ def validate_perimeter_ordering(tab: Tab) -> Tuple[bool, List[str]]:
         )
         return is_fp_corner_pair
 
-    for i in range(num_points):
-        for j in range(i + 1, num_points):
-            dist = np.linalg.norm(points_list[i] - points_list[j])
-            if dist < tolerance:
-                # Skip if this is an expected FP-corner duplicate
-                if not is_expected_duplicate(point_ids[i], point_ids[j]):
-                    errors.append(
-                        f"Tab {tab.tab_id}: Duplicate points at indices {i} ({point_ids[i]}) "
-                        f"and {j} ({point_ids[j]}), distance={dist:.10f}"
-                    )
+    # Pairwise distances of all perimeter points, only pairs i < j are checked
+    points_array = tab.points_array
+    distances = np.linalg.norm(points_array[:, None, :] - points_array[None, :, :], axis=2)
+    close_i, close_j = np.nonzero(np.triu(distances < tolerance, k=1))
+
+    for i, j in zip(close_i.tolist(), close_j.tolist()):
+        # Skip if this is an expected FP-corner duplicate
+        if not is_expected_duplicate(point_ids[i], point_ids[j]):
+            errors.append(
+                f"Tab {tab.tab_id}: Duplicate points at indices {i} ({point_ids[i]}) "
+                f"and {j} ({point_ids[j]}), distance={distances[i, j]:.10f}"
+            )
 
     # Check for edge crossings in 2D projections (XY, XZ, YZ)
     # This catches most self-intersecting polygons
-    def segments_intersect_2d(p1, p2, p3, p4, dims):
-        """Check if line segments p1-p2 and p3-p4 intersect in 2D projection."""
-        # Extract 2D coordinates based on projection dimensions
-        a1 = np.array([p1[dims[0]], p1[dims[1]]], dtype=float)
-        a2 = np.array([p2[dims[0]], p2[dims[1]]], dtype=float)
-        b1 = np.array([p3[dims[0]], p3[dims[1]]], dtype=float)
-        b2 = np.array([p4[dims[0]], p4[dims[1]]], dtype=float)
-
-        d1 = a2 - a1
-        d2 = b2 - b1
-
-        cross = d1[0] * d2[1] - d1[1] * d2[0]
-        if abs(cross) < 1e-10:
-            return False  # Parallel or collinear
-
-        diff = b1 - a1
-        t = (diff[0] * d2[1] - diff[1] * d2[0]) / cross
-        s = (diff[0] * d1[1] - diff[1] * d1[0]) / cross
-
-        # Check if intersection is within both segments (excluding endpoints)
-        return 0.01 < t < 0.99 and 0.01 < s < 0.99
-
-    # Check all pairs of non-adjacent edges
-    point_ids = list(tab.points.keys())
-    for i in range(num_points):
-        for j in range(i + 2, num_points):
-            # Skip adjacent edges and last-to-first edge
-            if j == num_points - 1 and i == 0:
-                continue
-
-            p1, p2 = points_list[i], points_list[(i + 1) % num_points]
-            p3, p4 = points_list[j], points_list[(j + 1) % num_points]
-
-            # Check all three 2D projections
-            for projection, dims in [('XY', (0, 1)), ('XZ', (0, 2)), ('YZ', (1, 2))]:
-                if segments_intersect_2d(p1, p2, p3, p4, dims):
-                    errors.append(
-                        f"Tab {tab.tab_id}: Edge {point_ids[i]}-{point_ids[(i+1)%num_points]} "
-                        f"crosses edge {point_ids[j]}-{point_ids[(j+1)%num_points]} "
-                        f"in {projection} projection (self-intersecting polygon)"
-                    )
+    # All pairs of non-adjacent edges (skipping the last-to-first edge against the first one)
+    # are checked in all three projections in one sweep: row m of the arrays is pair (i[m], j[m])
+    edge_i, edge_j = np.triu_indices(num_points, k=2)
+    keep = ~((edge_i == 0) & (edge_j == num_points - 1))
+    edge_i, edge_j = edge_i[keep], edge_j[keep]
+
+    edge_vecs = np.roll(points_array, -1, axis=0) - points_array
+    d1, d2 = edge_vecs[edge_i], edge_vecs[edge_j]
+    diff = points_array[edge_j] - points_array[edge_i]
+
+    # Projection k uses the coordinates (dim_u[k], dim_v[k])
+    projections = ('XY', 'XZ', 'YZ')
+    dim_u, dim_v = [0, 0, 1], [1, 2, 2]
+    cross = d1[:, dim_u] * d2[:, dim_v] - d1[:, dim_v] * d2[:, dim_u]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = (diff[:, dim_u] * d2[:, dim_v] - diff[:, dim_v] * d2[:, dim_u]) / cross
+        s = (diff[:, dim_u] * d1[:, dim_v] - diff[:, dim_v] * d1[:, dim_u]) / cross
+
+    # Parallel or collinear edges never cross; otherwise the intersection must lie within
+    # both segments (excluding endpoints)
+    crossing = (np.abs(cross) >= 1e-10) & (0.01 < t) & (t < 0.99) & (0.01 < s) & (s < 0.99)
+
+    for m, k in np.argwhere(crossing):
+        i, j = edge_i[m], edge_j[m]
+        errors.append(
+            f"Tab {tab.tab_id}: Edge {point_ids[i]}-{point_ids[(i+1)%num_points]} "
+            f"crosses edge {point_ids[j]}-{point_ids[(j+1)%num_points]} "
+            f"in {projections[k]} projection (self-intersecting polygon)"
+        )
 
     return len(errors) == 0, errors
 
@@ -195,11 +176,6 @@ def validate_naming_convention(tab: Tab) -> Tuple[bool, List[str]]:
     if not hasattr(tab, 'points') or not tab.points:
         return True, []  # No points to validate
 
-    # Pattern for bend/flange points: (FP|BP) + tab_ids + (L|R)
-    # Tab IDs can be: single digit (0), multi-digit (01), or composite (0_1, 01_02)
-    # Must have underscore separator between tab IDs
-    pattern = re.compile(r'^(FP|BP)(\d+(?:_\d+)+)(L|R)$')
-
     for point_id in tab.points.keys():
         # Skip corner points (A, B, C, D)
         if point_id in {'A', 'B', 'C', 'D'}:
@@ -207,7 +183,7 @@ def validate_naming_convention(tab: Tab) -> Tuple[bool, List[str]]:
 
         # Check if it's a bend/flange point
         if point_id.startswith('FP') or point_id.startswith('BP'):
-            match = pattern.match(point_id)
+            match = POINT_NAME_PATTERN.match(point_id)
             if not match:
                 errors.append(
                     f"Tab {tab.tab_id}: Point '{point_id}' does not follow naming convention. "
@@ -145,20 +145,16 @@ def split_tab_by_mounts(tab: Tab, n_surfaces: int, split_along: str,
         BC_norm = normalize(BC)
 
         if len(tab.mounts) >= 2:
-            # Calculate mount projections along both directions
-            projs_along_AB = []
-            projs_along_BC = []
-            for mount in tab.mounts:
-                if mount.global_coords is not None:
-                    mp = np.array(mount.global_coords, dtype=np.float64)
-                else:
-                    mp = A + mount.u * AB_norm + mount.v * BC_norm
-                projs_along_AB.append(np.dot(mp - A, AB_norm))
-                projs_along_BC.append(np.dot(mp - A, BC_norm))
+            # Calculate mount projections along both directions, column 0 along AB, column 1 along BC
+            mount_points = np.array([
+                mount.global_coords if mount.global_coords is not None
+                else A + mount.u * AB_norm + mount.v * BC_norm
+                for mount in tab.mounts
+            ], dtype=np.float64)
+            projs = (mount_points - A) @ np.column_stack((AB_norm, BC_norm))
 
             # Calculate spread (range) along each direction
-            spread_AB = max(projs_along_AB) - min(projs_along_AB)
-            spread_BC = max(projs_along_BC) - min(projs_along_BC)
+            spread_AB, spread_BC = np.ptp(projs, axis=0)
 
             # Split parallel to the edge where mounts have LESS spread
             # (i.e., travel along the direction where mounts ARE spread out)
@@ -60,9 +60,9 @@ def export_to_json(part, output_dir="exports"):
 
     export_data = create_part_json(part, timestamp)    
 
-    # 3. Write to file
+    # 3. Write to file (encoded in one go, json.dump would issue a write per token)
     with open(filepath, 'w') as f:
-        json.dump(export_data, f, indent=4)
+        f.write(json.dumps(export_data, indent=4))
 
     print(f"Exported solution to: {filepath}")
     return filepath
@@ -1,24 +1,29 @@
 from config.design_rules import min_flange_width, min_bend_angle
 
+import math
+
 import numpy as np
 from shapely import Polygon, make_valid
 from shapely.geometry import Polygon
 
 from typing import Set, Tuple
 
+from src.hgen_sm.create_segments.utils import norm3, cross3
+
 # ---------- FILTER: BPC1 und BPC2 dürfen nicht zu nah beieinander sein ----------
 def min_flange_width_filter(BPL, BPR):
     """Returns Talse if Bending Points are too close together"""
     min_distance_BPC = min_flange_width  # Minimale Distanz zwischen BPC1 und BPC2
-    distance_BPC = np.linalg.norm(BPL - BPR)
-    if distance_BPC < min_distance_BPC:
+    # Compare squared distances to avoid the sqrt
+    d = BPL - BPR
+    if d @ d < min_distance_BPC * min_distance_BPC:
         return False  # Überspringe diese Lösung
     return True
 
 def tab_fully_contains_rectangle(tab, rect, tol=1e-7):
     """Returns True if rectangle is fully contained in the tab"""
-    tab_pts = np.array(list(tab.points.values()))
-    rect_pts = np.array(list(rect.points.values()))
+    tab_pts = tab.points_array
+    rect_pts = rect.corners_array
 
     # 1. Determine the Plane Basis
     # Use two vectors on the plane to create a local 2D coordinate system
@@ -28,22 +33,20 @@ def tab_fully_contains_rectangle(tab, rect, tol=1e-7):
     v2 = rect_pts[2] - p0
     
     # Normal vector
-    normal = np.cross(v1, v2)
-    norm = np.linalg.norm(normal)
+    normal = cross3(v1, v2)
+    norm = norm3(normal)
     if norm < 1e-9: return False # Points are collinear
     normal /= norm
 
     # Create local X and Y axes (u, v) for the plane
-    u_axis = v1 / np.linalg.norm(v1)
-    v_axis = np.cross(normal, u_axis)
+    u_axis = v1 / norm3(v1)
+    v_axis = cross3(normal, u_axis)
+    uv_axes = np.column_stack((u_axis, v_axis))
 
     def project_to_local_2d(pts):
         """Projects 3D points onto the local (u, v) coordinates of the plane."""
         # Translate to origin, then dot product with local axes
-        shifted = pts - p0
-        u = np.dot(shifted, u_axis)
-        v = np.dot(shifted, v_axis)
-        return np.column_stack((u, v))
+        return np.dot(pts - p0, uv_axes)
 
     # 2. Convert all points to the same local 2D space
     tab_2d = project_to_local_2d(tab_pts)
@@ -68,10 +71,10 @@ def lines_cross(P1, P2, P3, P4, buffer=0.1):
         # This is the most robust way to implement a physical buffer
         def dist_pt_to_seg(p, s1, s2):
             l2 = np.sum((s1 - s2)**2)
-            if l2 == 0: return np.linalg.norm(p - s1)
+            if l2 == 0: return math.hypot(*(p - s1))
             t = max(0, min(1, np.dot(p - s1, s2 - s1) / l2))
             projection = s1 + t * (s2 - s1)
-            return np.linalg.norm(p - projection)
+            return math.hypot(*(p - projection))
 
         return min(
             dist_pt_to_seg(a, c, d),
@@ -113,30 +116,37 @@ def minimum_angle_filter(planeA, planeB, min_bend_angle=min_bend_angle):
     Returns True if the internal bend angle is >= min_bend_angle.
     Uses plane positions to enforce consistent 'outward' normals.
     """
-    # 1. Normalize initial vectors
-    nA = planeA.orientation / np.linalg.norm(planeA.orientation)
-    nB = planeB.orientation / np.linalg.norm(planeB.orientation)
+    # Scalar math on the 3-vectors: this runs for every bend candidate and numpy's
+    # per-call overhead (norm, clip, arccos on 0-d arrays) dominates at this size
+    nA = planeA.orientation
+    nB = planeB.orientation
 
-    # 2. Create the chord vector from A to B
+    # 1. Create the chord vector from A to B
     v_AB = planeB.position - planeA.position
 
     # Avoid zero-vector issues if positions are identical (rare)
-    if np.linalg.norm(v_AB) < 1e-6:
+    if np.dot(v_AB, v_AB) < 1e-12:
         return True  # Treat as overlapping/safe
 
-    # 3. Enforce "Outward" Normals
+    # 2. Enforce "Outward" Normals (only the sign matters, normalization happens in 3.)
+    sign = 1.0
     if np.dot(nA, v_AB) > 0:
-        nA = -nA
+        sign = -sign
 
     # Check nB relative to path from B to A (which is -v_AB)
-    if np.dot(nB, -v_AB) > 0:
-        nB = -nB
+    if np.dot(nB, v_AB) < 0:
+        sign = -sign
 
-    # 4. Calculate Angle between Outward Normals
-    dot_product = np.clip(np.dot(nA, nB), -1.0, 1.0)
-    deflection_angle = np.degrees(np.arccos(dot_product))
+    # 3. Calculate Angle between Outward Normals
+    # A degenerate plane (e.g. collinear bending points) has a zero normal and no angle
+    norm_product = math.sqrt(np.dot(nA, nA) * np.dot(nB, nB))
+    if norm_product < 1e-18:
+        return False
+    dot_product = sign * float(np.dot(nA, nB)) / norm_product
+    dot_product = min(max(dot_product, -1.0), 1.0)
+    deflection_angle = math.degrees(math.acos(dot_product))
 
-    # 5. Calculate Internal Angle
+    # 4. Calculate Internal Angle
     internal_angle = 180.0 - deflection_angle
 
     return internal_angle >= min_bend_angle
@@ -164,7 +174,7 @@ def _get_polygon_plane(points):
     v1_idx = 1
     for i in range(1, len(pts)):
         candidate = pts[i] - p0
-        if np.linalg.norm(candidate) > 1e-9:
+        if norm3(candidate) > 1e-9:
             v1 = candidate
             v1_idx = i
             break
@@ -175,8 +185,8 @@ def _get_polygon_plane(points):
     # Find second non-collinear point for v2
     for i in range(v1_idx + 1, len(pts)):
         v2 = pts[i] - p0
-        normal = np.cross(v1, v2)
-        norm = np.linalg.norm(normal)
+        normal = cross3(v1, v2)
+        norm = norm3(normal)
         if norm > 1e-9:
             normal = normal / norm
             d = np.dot(normal, p0)
@@ -188,10 +198,10 @@ def _get_polygon_plane(points):
             for k in range(j + 1, len(pts)):
                 v1 = pts[j] - pts[i]
                 v2 = pts[k] - pts[i]
-                if np.linalg.norm(v1) < 1e-9 or np.linalg.norm(v2) < 1e-9:
+                if norm3(v1) < 1e-9 or norm3(v2) < 1e-9:
                     continue
-                normal = np.cross(v1, v2)
-                norm = np.linalg.norm(normal)
+                normal = cross3(v1, v2)
+                norm = norm3(normal)
                 if norm > 1e-9:
                     normal = normal / norm
                     d = np.dot(normal, pts[i])
@@ -206,8 +216,8 @@ def _planes_are_parallel(plane1, plane2, tol=1e-6):
         return True
     n1, _ = plane1
     n2, _ = plane2
-    cross = np.cross(n1, n2)
-    return np.linalg.norm(cross) < tol
+    cross = cross3(n1, n2)
+    return norm3(cross) < tol
 
 
 def _planes_are_coplanar(plane1, plane2, pts1, tol=1e-6):
@@ -232,8 +242,8 @@ def _get_plane_intersection_line(plane1, plane2):
     n2, d2 = plane2
 
     # Direction of intersection line
-    direction = np.cross(n1, n2)
-    dir_norm = np.linalg.norm(direction)
+    direction = cross3(n1, n2)
+    dir_norm = norm3(direction)
 
     if dir_norm < 1e-9:
         return None  # Parallel planes
@@ -311,7 +321,7 @@ def _line_intersects_polygon_interior(line_point, line_dir, polygon_pts, plane_n
     u_axis = None
     for i in range(1, n):
         candidate = pts[i] - origin
-        norm = np.linalg.norm(candidate)
+        norm = norm3(candidate)
         if norm > 1e-9:
             u_axis = candidate / norm
             break
@@ -319,18 +329,15 @@ def _line_intersects_polygon_interior(line_point, line_dir, polygon_pts, plane_n
     if u_axis is None:
         return False  # Degenerate polygon
 
-    v_axis = np.cross(plane_normal, u_axis)
-    v_norm = np.linalg.norm(v_axis)
+    v_axis = cross3(plane_normal, u_axis)
+    v_norm = norm3(v_axis)
     if v_norm < 1e-9:
         return False
     v_axis = v_axis / v_norm
 
     # Project polygon points to 2D
-    pts_2d = []
-    for p in pts:
-        rel = p - origin
-        pts_2d.append([np.dot(rel, u_axis), np.dot(rel, v_axis)])
-    pts_2d = np.array(pts_2d)
+    rel = pts - origin
+    pts_2d = np.column_stack((np.einsum('ij,j->i', rel, u_axis), np.einsum('ij,j->i', rel, v_axis)))
 
     # Check if line direction is parallel to plane
     dot_dir_normal = np.dot(line_dir, plane_normal)
@@ -390,7 +397,7 @@ def _polygons_share_edge(pts1, pts2, tol=1e-6):
     shared_count = 0
     for p1 in pts1:
         for p2 in pts2:
-            if np.linalg.norm(p1 - p2) < tol:
+            if norm3(p1 - p2) < tol:
                 shared_count += 1
                 if shared_count >= 2:
                     return True
@@ -419,7 +426,7 @@ def _check_coplanar_polygon_intersection(pts1, pts2, tol=1e-6):
     u_axis = None
     for i in range(1, len(pts1)):
         candidate = pts1[i] - origin
-        norm = np.linalg.norm(candidate)
+        norm = norm3(candidate)
         if norm > 1e-9:
             u_axis = candidate / norm
             break
@@ -427,18 +434,16 @@ def _check_coplanar_polygon_intersection(pts1, pts2, tol=1e-6):
     if u_axis is None:
         return False  # Degenerate polygon
 
-    v_axis = np.cross(normal, u_axis)
-    v_norm = np.linalg.norm(v_axis)
+    v_axis = cross3(normal, u_axis)
+    v_norm = norm3(v_axis)
     if v_norm < 1e-9:
         return False
     v_axis = v_axis / v_norm
+    uv_axes = np.column_stack((u_axis, v_axis))
 
     def project_to_2d(pts):
-        result = []
-        for p in pts:
-            rel = p - origin
-            result.append([np.dot(rel, u_axis), np.dot(rel, v_axis)])
-        return result
+        # Both local coordinates in one (N, 3) @ (3, 2) product
+        return np.dot(pts - origin, uv_axes)
 
     pts1_2d = project_to_2d(pts1)
     pts2_2d = project_to_2d(pts2)
@@ -534,31 +539,33 @@ def collision_filter(tabs_dict, tol=0.1):
 
     for i in range(n):
         for j in range(i + 1, n):
-            id_i = str(tabs[i].tab_id)
-            id_j = str(tabs[j].tab_id)
+            if tabs_collide(tabs[i], tabs[j], tol):
+                return True
+
+    return False
 
-            # Skip connected tabs (one ID contains the other)
-            if id_i in id_j or id_j in id_i:
-                continue
 
-            pts_i = np.array(list(tabs[i].points.values()))
-            pts_j = np.array(list(tabs[j].points.values()))
+def tabs_collide(tab_a, tab_b, tol=0.1):
+    """Check if two tabs of an assembled part collide, connected tabs never do."""
+    id_a = str(tab_a.tab_id)
+    id_b = str(tab_b.tab_id)
 
-            # Fast AABB bounding box pre-check
-            if not _bounds_collide_with_gap(pts_i, pts_j, gap=tol):
-                continue
+    # Skip connected tabs (one ID contains the other)
+    if id_a in id_b or id_b in id_a:
+        return False
 
-            # Full 3D collision check
-            if _tabs_collide_3d(pts_i, pts_j, tol):
-                return True
+    # Fast AABB bounding box pre-check, the boxes are cached on the tabs
+    if not _bounds_collide_with_gap(tab_a.bounds, tab_b.bounds, gap=tol):
+        return False
 
-    return False
+    # Full 3D collision check
+    return _tabs_collide_3d(tab_a.points_array, tab_b.points_array, tol)
 
 
-def _bounds_collide_with_gap(pts1, pts2, gap):
-    """Fast AABB bounding box collision check."""
-    min1, max1 = pts1.min(axis=0), pts1.max(axis=0)
-    min2, max2 = pts2.min(axis=0), pts2.max(axis=0)
+def _bounds_collide_with_gap(bounds1, bounds2, gap):
+    """Fast AABB bounding box collision check on (min, max) corner pairs."""
+    min1, max1 = bounds1
+    min2, max2 = bounds2
     return np.all(min1 - gap < max2) and np.all(min2 - gap < max1)
 
 def thin_segment_filter(segment):
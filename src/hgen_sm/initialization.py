@@ -2,6 +2,7 @@ import numpy as np
 from typing import Dict, List
 
 from src.hgen_sm.data import Rectangle, Part, Tab, Mount
+from src.hgen_sm.create_segments.utils import norm3
 from config.design_rules import min_screw_to_edge_distance, mount_hole_diameter
 
 
@@ -72,16 +73,16 @@ def point_to_line_distance_3d(point, line_start, line_end):
 
     line_vec = line_end - line_start
     point_vec = point - line_start
-    line_len = np.linalg.norm(line_vec)
+    line_len = norm3(line_vec)
 
     if line_len == 0:
-        return np.linalg.norm(point_vec)
+        return norm3(point_vec)
 
     t = np.dot(point_vec, line_vec) / (line_len * line_len)
     t = max(0, min(1, t))
     projection = line_start + t * line_vec
 
-    return np.linalg.norm(point - projection)
+    return norm3(point - projection)
 
 
 def adjust_rectangle_for_mounts(A, B, C, mount_points, min_dist):
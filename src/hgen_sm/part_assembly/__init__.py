@@ -1,4 +1,4 @@
 # src/hgen_sm/part_assembly/__init__.py
-from .assemble import part_assembly
+from .assemble import part_assembly, compatible_combinations, assemble_combinations
 
-__all__ = ["part_assembly"]
\ No newline at end of file
+__all__ = ["part_assembly", "compatible_combinations", "assemble_combinations"]
\ No newline at end of file
@@ -1,7 +1,9 @@
 from src.hgen_sm.part_assembly.merge_helpers import extract_tabs_from_segments, merge_points, merge_multiple_tabs
-from src.hgen_sm.filters import collision_filter
+from src.hgen_sm.filters import collision_filter, tabs_collide
 from src.hgen_sm.data import validate_part
 
+import numpy as np
+
 def part_assembly(part, segments, filter_cfg):
     # Start with existing tabs to preserve unconnected ones (e.g., split surfaces)
     new_tabs_dict = {tab_id: tab for tab_id, tab in part.tabs.items()}
@@ -60,4 +62,91 @@ def part_assembly(part, segments, filter_cfg):
         # Don't reject the part - just warn, since validation might have false positives
         # return None
 
-    return part
\ No newline at end of file
+    return part
+
+def compatible_combinations(segments_library, filter_cfg=None):
+    """
+    Yields the same combinations as itertools.product(*segments_library), minus the ones
+    part_assembly would reject because two of their segments are incompatible.
+
+    A tab that shows up in exactly two slots of the sequence is merged from only those two
+    segments, and a tab that shows up in a single slot ends up in the part unchanged. So
+    failing merges and (with the Collisions filter on) collisions between single-slot tabs
+    are checked once per pair of segments instead of once per combination, and whole
+    branches of the product are skipped when a check fails.
+    """
+    n_slots = len(segments_library)
+    if n_slots == 0 or any(len(segments) == 0 for segments in segments_library):
+        return
+
+    # Slots in which each tab id appears; tabs missing from some segment of a slot are left out
+    slots_per_tab = {}
+    not_in_every_segment = set()
+    for slot, segments in enumerate(segments_library):
+        tab_id_sets = [{tab.tab_id for tab in segment.tabs.values()} for segment in segments]
+        for tab_id in set.union(*tab_id_sets):
+            slots_per_tab.setdefault(tab_id, []).append(slot)
+            if not all(tab_id in tab_ids for tab_ids in tab_id_sets):
+                not_in_every_segment.add(tab_id)
+
+    # constraints[k]: (i, matrix) with matrix[j_i, j_k] telling if segment j_i of slot i and j_k of slot k fit
+    constraints = [[] for _ in range(n_slots)]
+    for tab_id, slots in slots_per_tab.items():
+        if len(slots) != 2 or tab_id in not_in_every_segment:
+            continue
+        i, k = slots
+        tabs_i = [extract_tabs_from_segments(tab_id, [segment]) for segment in segments_library[i]]
+        tabs_k = [extract_tabs_from_segments(tab_id, [segment]) for segment in segments_library[k]]
+        if any(len(tabs) != 1 for tabs in tabs_i + tabs_k):
+            continue
+        matrix = np.array([[merge_multiple_tabs(tab_i + tab_k) is not None for tab_k in tabs_k] for tab_i in tabs_i])
+        constraints[k].append((i, matrix))
+
+    if filter_cfg is not None and filter_cfg.get("Collisions", False):
+        # Tabs of a segment that no other slot touches, per slot and segment
+        own_tabs = [[[tab for tab in segment.tabs.values() if slots_per_tab[tab.tab_id] == [slot]]
+                     for segment in segments]
+                    for slot, segments in enumerate(segments_library)]
+        for k in range(n_slots):
+            for i in range(k):
+                matrix = np.array([[not any(tabs_collide(tab_i, tab_k) for tab_i in tabs_i for tab_k in tabs_k)
+                                    for tabs_k in own_tabs[k]]
+                                   for tabs_i in own_tabs[i]])
+                constraints[k].append((i, matrix))
+
+    # Combinations are walked as index tuples; the segments of the next slot that fit the
+    # chosen prefix are found with one boolean AND over the matching matrix rows
+    indices = []
+
+    def extend():
+        slot = len(indices)
+        if slot == n_slots:
+            yield tuple(segments_library[s][j] for s, j in enumerate(indices))
+            return
+        allowed = np.ones(len(segments_library[slot]), dtype=bool)
+        for i, matrix in constraints[slot]:
+            allowed &= matrix[indices[i]]
+        for j in np.flatnonzero(allowed).tolist():
+            indices.append(j)
+            yield from extend()
+            indices.pop()
+
+    yield from extend()
+
+
+def assemble_combinations(part, combinations, filter_cfg):
+    """
+    Runs part_assembly for every segment combination on a fresh copy of part.
+
+    Returns the assembled parts in the order of the combinations, rejected ones left out.
+    Top-level so it can also run in worker processes on chunks of combinations.
+    """
+    assembled = []
+    for segments_combination in combinations:
+        # part_assembly only swaps in the (cloned) segment tabs, the part's own tabs are left as they are
+        new_part = part.cow_copy()
+        new_segments_combination = tuple(segment.clone() for segment in segments_combination)
+        new_part = part_assembly(new_part, new_segments_combination, filter_cfg)
+        if new_part is not None:
+            assembled.append(new_part)
+    return assembled
@@ -1,6 +1,21 @@
 from typing import Dict, Any, Optional, List, Set, Tuple
 import numpy as np
 from collections import OrderedDict
+from operator import itemgetter
+
+from src.hgen_sm.create_segments.utils import norm3
+
+CORNER_IDS = ('A', 'B', 'C', 'D')
+_CORNER_SET = frozenset(CORNER_IDS)
+# Fetches the four corners of a points dict in one call, raises KeyError if one is missing
+_get_corners = itemgetter(*CORNER_IDS)
+
+def points_close(a, b, atol=1e-6, rtol=1e-5):
+    """np.allclose(a, b, atol=atol) for two finite 3D points, without its broadcasting/NaN handling."""
+    d = np.abs(a - b)
+    tol = atol + rtol * np.abs(b)
+    return d[0] <= tol[0] and d[1] <= tol[1] and d[2] <= tol[2]
+
 
 def extract_tabs_from_segments(tab_id, segments):
     tab_id 
@@ -140,7 +155,7 @@ def detect_edge(point: np.ndarray, corners: Dict[str, np.ndarray], tolerance: fl
     for edge_name, start, end in edges:
         # Vector from start to end of edge
         edge_vec = end - start
-        edge_length = np.linalg.norm(edge_vec)
+        edge_length = norm3(edge_vec)
 
         if edge_length < tolerance:
             continue  # Degenerate edge
@@ -155,7 +170,7 @@ def detect_edge(point: np.ndarray, corners: Dict[str, np.ndarray], tolerance: fl
 
         # Calculate perpendicular distance from point to edge line
         projection_point = start + projection_length * edge_dir
-        perp_distance = np.linalg.norm(point - projection_point)
+        perp_distance = norm3(point - projection_point)
 
         # Track the closest edge (in case point is near a corner)
         if perp_distance < min_distance:
@@ -184,7 +199,7 @@ def sort_points_along_edge(points: List[Tuple[str, np.ndarray]],
         Sorted list of (point_name, coordinate) tuples
     """
     edge_vec = edge_end - edge_start
-    edge_length = np.linalg.norm(edge_vec)
+    edge_length = norm3(edge_vec)
 
     if edge_length < 1e-6:
         return points  # Degenerate edge, return unsorted
@@ -228,18 +243,20 @@ def merge_multiple_tabs(tabs: List[Any]) -> Optional[Dict[str, np.ndarray]]:
         return merge_points(tabs)
 
     # Extract corner points from first tab (should be identical across all tabs)
-    corners = {}
-    for corner in ['A', 'B', 'C', 'D']:
-        if corner not in tabs[0].points:
-            return None  # Missing corner - cannot proceed
-        corners[corner] = tabs[0].points[corner]
+    try:
+        corner_points = _get_corners(tabs[0].points)
+    except KeyError:
+        return None  # Missing corner - cannot proceed
+    corners = dict(zip(CORNER_IDS, corner_points))
 
     # Verify all tabs have the same corner positions
     for tab in tabs[1:]:
-        for corner in ['A', 'B', 'C', 'D']:
-            if corner not in tab.points:
-                return None
-            if not np.allclose(tab.points[corner], corners[corner], atol=1e-6):
+        try:
+            tab_corner_points = _get_corners(tab.points)
+        except KeyError:
+            return None
+        for point, corner_point in zip(tab_corner_points, corner_points):
+            if not points_close(point, corner_point):
                 return None  # Corner mismatch - tabs don't align
 
     # MANUFACTURABILITY CHECK: Track which tab instance uses which edge
@@ -251,23 +268,20 @@ def merge_multiple_tabs(tabs: List[Any]) -> Optional[Dict[str, np.ndarray]]:
         'DA': []
     }
 
-    # For each tab instance, determine which edge it uses
-    for tab_idx, tab in enumerate(tabs):
-        # Find non-corner points in this tab instance
-        non_corner_points = [(name, coord) for name, coord in tab.points.items()
-                            if name not in ['A', 'B', 'C', 'D']]
+    # Non-corner points of every tab instance with the edge they lie on, detected once
+    # here and shared by the usage check and the grouping below
+    non_corner_points_per_tab = [[(name, coord, detect_edge(coord, corners))
+                                  for name, coord in tab.points.items() if name not in _CORNER_SET]
+                                 for tab in tabs]
 
+    # For each tab instance, determine which edge it uses
+    for tab_idx, non_corner_points in enumerate(non_corner_points_per_tab):
         if not non_corner_points:
             # No flanges on this instance - skip
             continue
 
-        # Detect which edge these points belong to
         # All points from one tab instance should be on the same edge
-        edges_used = set()
-        for point_name, coord in non_corner_points:
-            edge = detect_edge(coord, corners)
-            if edge is not None:
-                edges_used.add(edge)
+        edges_used = {edge for _, _, edge in non_corner_points if edge is not None}
 
         # Check if all points are on the same edge
         if len(edges_used) > 1:
@@ -293,26 +307,23 @@ def merge_multiple_tabs(tabs: List[Any]) -> Optional[Dict[str, np.ndarray]]:
         'DA': []
     }
 
-    for tab in tabs:
-        for point_name, coord in tab.points.items():
-            if point_name not in ['A', 'B', 'C', 'D']:
-                edge = detect_edge(coord, corners)
-
-                if edge is None:
-                    # Point doesn't lie on any edge - this shouldn't happen
-                    # Log warning but continue
-                    print(f"WARNING: Point {point_name} at {coord} doesn't lie on any edge")
-                    continue
-
-                # Check if this point is already in the list (avoid duplicates)
-                duplicate = False
-                for existing_name, existing_coord in edge_points[edge]:
-                    if np.allclose(coord, existing_coord, atol=1e-6):
-                        duplicate = True
-                        break
-
-                if not duplicate:
-                    edge_points[edge].append((point_name, coord))
+    for non_corner_points in non_corner_points_per_tab:
+        for point_name, coord, edge in non_corner_points:
+            if edge is None:
+                # Point doesn't lie on any edge - this shouldn't happen
+                # Log warning but continue
+                print(f"WARNING: Point {point_name} at {coord} doesn't lie on any edge")
+                continue
+
+            # Check if this point is already in the list (avoid duplicates)
+            duplicate = False
+            for existing_name, existing_coord in edge_points[edge]:
+                if points_close(coord, existing_coord):
+                    duplicate = True
+                    break
+
+            if not duplicate:
+                edge_points[edge].append((point_name, coord))
 
     # Sort points along each edge
     sorted_edge_points = {}
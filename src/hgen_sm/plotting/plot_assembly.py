@@ -228,10 +228,13 @@ def plot_part(part, plotter, plot_cfg, solution_idx, len_solutions):
     plotter.show_grid()
     plotter.render()
 
-def plot_solutions(solutions, plot_cfg, plotter=pv.Plotter()):
+def plot_solutions(solutions, plot_cfg, plotter=None):
     """
     Create interactive plotting window, which can be cycled through to explore all the solutions.
     """
+    # Created here rather than as a default argument, so importing the package does not open a render window
+    if plotter is None:
+        plotter = pv.Plotter()
     solution_idx = [0]
     def show_solution(idx):
         plotter.clear()
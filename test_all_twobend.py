@@ -1,24 +1,25 @@
 """
 Test all two-bend solutions to check flange positioning
 """
-import yaml
+import os
+import sys
+
 import numpy as np
-from pathlib import Path
 
-PROJECT_ROOT = Path(__file__).resolve().parent
-CONFIG_FILE = PROJECT_ROOT / "config" / "config.yaml"
-from config.user_input import RECTANGLE_INPUTS
-with CONFIG_FILE.open("r") as f:
-    cfg = yaml.load(f, Loader=yaml.FullLoader)
+from shared_setup import load_config, cached_sequences
+cfg = load_config()
+
+from src.hgen_sm import Part, create_segments
+from src.hgen_sm.data.tab import BEND_POINT
 
-from src.hgen_sm import Part, initialize_objects, determine_sequences, create_segments
+# Point coordinates are only printed when someone reads them
+VERBOSE = sys.stdout.isatty() or bool(os.environ.get("SEGMENT_VERBOSE"))
 
 segment_cfg = cfg.get('design_exploration')
 filter_cfg = cfg.get('filter')
 
-# Initialize
-part = initialize_objects(RECTANGLE_INPUTS)
-variants = determine_sequences(part, cfg)
+# Initialize (shared with the other scripts in this process)
+variants = cached_sequences()
 variant_part, sequences = variants[0]  # Unseparated variant
 
 # Process first pair
@@ -27,15 +28,16 @@ tab_x = variant_part.tabs[pair[0]]
 tab_z = variant_part.tabs[pair[1]]
 
 print(f"Testing pair: {pair}")
-print(f"\nTab {pair[0]} corners:")
-for c_id in ['A', 'B', 'C', 'D']:
-    if c_id in tab_x.rectangle.points:
-        print(f"  {c_id}: {tab_x.rectangle.points[c_id]}")
+if VERBOSE:
+    print(f"\nTab {pair[0]} corners:")
+    for c_id in ['A', 'B', 'C', 'D']:
+        if c_id in tab_x.rectangle.points:
+            print(f"  {c_id}: {tab_x.rectangle.points[c_id]}")
 
-print(f"\nTab {pair[1]} corners:")
-for c_id in ['A', 'B', 'C', 'D']:
-    if c_id in tab_z.rectangle.points:
-        print(f"  {c_id}: {tab_z.rectangle.points[c_id]}")
+    print(f"\nTab {pair[1]} corners:")
+    for c_id in ['A', 'B', 'C', 'D']:
+        if c_id in tab_z.rectangle.points:
+            print(f"  {c_id}: {tab_z.rectangle.points[c_id]}")
 
 segment_tabs = {'tab_x': tab_x, 'tab_z': tab_z}
 segment = Part(sequence=pair, tabs=segment_tabs)
@@ -49,8 +51,8 @@ print(f"\n{len(two_bend_segments)} two-bend segments generated\n")
 
 def check_flange_position(tab, tab_id, rect_corners):
     """Check if BP points are outside the rectangle"""
-    bp_points = {k: v for k, v in tab.points.items() if k.startswith('BP')}
-    if not bp_points:
+    bp_rows = np.flatnonzero(tab.point_types == BEND_POINT)
+    if not bp_rows.size:
         return "No BP points"
 
     # Get rectangle bounds
@@ -61,13 +63,11 @@ def check_flange_position(tab, tab_id, rect_corners):
     min_coords = np.min(corners, axis=0)
     max_coords = np.max(corners, axis=0)
 
-    # Check each BP point
-    issues = []
-    for bp_id, bp_coord in bp_points.items():
-        # Check if BP is inside rectangle bounds (with small tolerance)
-        inside = all(min_coords[i] - 0.1 <= bp_coord[i] <= max_coords[i] + 0.1 for i in range(3))
-        if inside:
-            issues.append(f"{bp_id} at {bp_coord} is INSIDE rectangle bounds [{min_coords}, {max_coords}]")
+    # Check all BP points at once: is a BP inside the rectangle bounds (with small tolerance)?
+    bp_coords = tab.points_array[bp_rows]
+    inside = np.all((bp_coords >= min_coords - 0.1) & (bp_coords <= max_coords + 0.1), axis=1)
+    issues = [f"{tab.point_names[bp_rows[i]]} at {bp_coords[i]} is INSIDE rectangle bounds [{min_coords}, {max_coords}]"
+              for i in np.flatnonzero(inside)]
 
     if issues:
         return "WRONG: " + "; ".join(issues)
@@ -86,7 +86,7 @@ for i, seg in enumerate(two_bend_segments[:10]):  # Check first 10
         print(f"  Perimeter: {list(tab_x_result.points.keys())}")
 
         bp_points = {k: v for k, v in tab_x_result.points.items() if k.startswith('BP')}
-        if bp_points:
+        if VERBOSE and bp_points:
             print(f"  BP points:")
             for bp_id, bp_coord in bp_points.items():
                 print(f"    {bp_id}: {bp_coord}")
@@ -99,7 +99,7 @@ for i, seg in enumerate(two_bend_segments[:10]):  # Check first 10
         print(f"  Perimeter: {list(tab_z_result.points.keys())}")
 
         bp_points = {k: v for k, v in tab_z_result.points.items() if k.startswith('BP')}
-        if bp_points:
+        if VERBOSE and bp_points:
             print(f"  BP points:")
             for bp_id, bp_coord in bp_points.items():
                 print(f"    {bp_id}: {bp_coord}")
@@ -1,18 +1,16 @@
 """
 Detailed analysis of Approach 2 to verify FP positioning
 """
-import yaml
 import numpy as np
-from pathlib import Path
 
-PROJECT_ROOT = Path(__file__).resolve().parent
-CONFIG_FILE = PROJECT_ROOT / "config" / "config.yaml"
-
-with CONFIG_FILE.open("r") as f:
-    cfg = yaml.load(f, Loader=yaml.FullLoader)
+from shared_setup import load_config
+cfg = load_config()
 
 from src.hgen_sm.data import Rectangle, Tab
 from src.hgen_sm import Part, create_segments
+from src.hgen_sm.data.tab import CORNER_POINT, FLANGE_POINT, BEND_POINT
+
+CORNERS = frozenset('ABCD')
 
 segment_cfg = cfg.get('design_exploration')
 filter_cfg = cfg.get('filter')
@@ -68,10 +66,11 @@ for tab_id, tab in seg.tabs.items():
     print(f"{tab_id}:")
     print(f"  Perimeter: {list(tab.points.keys())}")
 
-    # Extract points by type
-    corners = {k: v for k, v in tab.points.items() if k in ['A', 'B', 'C', 'D']}
-    fp_points = {k: v for k, v in tab.points.items() if k.startswith('FP')}
-    bp_points = {k: v for k, v in tab.points.items() if k.startswith('BP')}
+    # Extract points by type (classified once per tab, see Tab.point_types)
+    names, types = tab.point_names, tab.point_types
+    corners = {names[i]: tab.points[names[i]] for i in np.flatnonzero(types == CORNER_POINT)}
+    fp_points = {names[i]: tab.points[names[i]] for i in np.flatnonzero(types == FLANGE_POINT)}
+    bp_points = {names[i]: tab.points[names[i]] for i in np.flatnonzero(types == BEND_POINT)}
 
     # Identify approach based on corner count
     if tab_id in ['tab_x', 'tab_z']:
@@ -94,12 +93,18 @@ for tab_id, tab in seg.tabs.items():
     if fp_points and bp_points:
         print(f"\n  FP to BP distance verification (should be ~10mm):")
 
-        for fp_id, fp_coord in fp_points.items():
-            # Find corresponding BP (same L/R suffix)
-            bp_id = fp_id.replace('FP', 'BP')
-            if bp_id in bp_points:
-                bp_coord = bp_points[bp_id]
-                distance = np.linalg.norm(fp_coord - bp_coord)
+        # Corresponding BP of every FP (same L/R suffix), all distances measured in one go
+        bp_ids = {fp_id: fp_id.replace('FP', 'BP') for fp_id in fp_points}
+        matched = [fp_id for fp_id, bp_id in bp_ids.items() if bp_id in bp_points]
+        distances = {}
+        if matched:
+            fp_coords = np.array([fp_points[fp_id] for fp_id in matched])
+            bp_coords = np.array([bp_points[bp_ids[fp_id]] for fp_id in matched])
+            distances = dict(zip(matched, np.linalg.norm(fp_coords - bp_coords, axis=1)))
+
+        for fp_id, bp_id in bp_ids.items():
+            if fp_id in distances:
+                distance = distances[fp_id]
                 status = "OK" if abs(distance - 10.0) < 0.1 else "MISMATCH"
                 print(f"    {fp_id} -> {bp_id}: {distance:.4f}mm [{status}]")
             else:
@@ -107,17 +112,15 @@ for tab_id, tab in seg.tabs.items():
 
     # Check perimeter validity
     print(f"\n  Perimeter validity check:")
-    points_list = list(tab.points.items())
-
-    # Check for duplicates
-    has_duplicates = False
-    for i in range(len(points_list)):
-        curr_id, curr_pt = points_list[i]
-        next_id, next_pt = points_list[(i+1) % len(points_list)]
-        dist = np.linalg.norm(next_pt - curr_pt)
-        if dist < 0.001:
-            print(f"    WARNING: Duplicate {curr_id} -> {next_id}")
-            has_duplicates = True
+    names = tab.point_names
+    pts = tab.points_array
+
+    # Check for duplicates (each point against its successor, wrapping around)
+    dists = np.linalg.norm(np.roll(pts, -1, axis=0) - pts, axis=1)
+    duplicate_idx = np.flatnonzero(dists < 0.001)
+    for i in duplicate_idx:
+        print(f"    WARNING: Duplicate {names[i]} -> {names[(i+1) % len(names)]}")
+    has_duplicates = duplicate_idx.size > 0
 
     if not has_duplicates:
         print(f"    OK: No duplicate consecutive points")
@@ -138,7 +141,7 @@ print(f"\n  Checking tab_z structure...")
 
 for tab_id, tab in seg.tabs.items():
     if tab_id == 'tab_z':
-        corners = {k: v for k, v in tab.points.items() if k in ['A', 'B', 'C', 'D']}
+        corners = {k: v for k, v in tab.points.items() if k in CORNERS}
         if len(corners) == 3:
             perimeter = list(tab.points.keys())
 
@@ -151,7 +154,7 @@ for tab_id, tab in seg.tabs.items():
             print(f"  Perimeter: {perimeter}")
 
             # Check if bend points are where removed corner should be
-            if removed_corner in ['A', 'B', 'C', 'D']:
+            if removed_corner in CORNERS:
                 expected_order = ['A', 'B', 'C', 'D']
                 removed_idx = expected_order.index(removed_corner)
                 left_corner = expected_order[(removed_idx - 1) % 4]
@@ -160,9 +163,10 @@ for tab_id, tab in seg.tabs.items():
                 print(f"  Expected: Bend points between {left_corner} and {right_corner}")
 
                 # Find positions in perimeter
-                if left_corner in perimeter and right_corner in perimeter:
-                    left_idx = perimeter.index(left_corner)
-                    right_idx = perimeter.index(right_corner)
+                position = tab.point_index
+                if left_corner in position and right_corner in position:
+                    left_idx = position[left_corner]
+                    right_idx = position[right_corner]
 
                     # Get points between left and right
                     if right_idx > left_idx:
@@ -1,22 +1,29 @@
 """
 Enhanced test to verify both Approach 1 and Approach 2 of two_bend strategy
 """
-import yaml
+import os
+import sys
 import numpy as np
-from pathlib import Path
+from scipy.spatial.distance import cdist
 
-PROJECT_ROOT = Path(__file__).resolve().parent
-CONFIG_FILE = PROJECT_ROOT / "config" / "config.yaml"
+from shared_setup import load_config
+cfg = load_config()
 
-with CONFIG_FILE.open("r") as f:
-    cfg = yaml.load(f, Loader=yaml.FullLoader)
-
-from src.hgen_sm.data import Rectangle
+from src.hgen_sm.data import Rectangle, Tab
+from src.hgen_sm.data.tab import CORNER_POINT, FLANGE_POINT, BEND_POINT
 from src.hgen_sm import Part, initialize_objects, determine_sequences, create_segments
 
 segment_cfg = cfg.get('design_exploration')
 filter_cfg = cfg.get('filter')
 
+# Print banners
+SEP = '=' * 70
+HASH = '#' * 70
+DASH = '-' * 70
+
+# The per-FP distance listing is only printed when someone reads it
+VERBOSE = sys.stdout.isatty() or bool(os.environ.get("SEGMENT_VERBOSE"))
+
 def create_test_cases():
     """Create multiple test cases to trigger different approaches"""
 
@@ -98,89 +105,91 @@ def create_test_cases():
     return test_cases
 
 
+def fp_corner_distances(tab):
+    """Return (fp_ids, corner_ids, distance matrix) for the FP (rows) and corners (columns) of a tab."""
+    names, types = tab.point_names, tab.point_types
+    corner_rows = np.flatnonzero(types == CORNER_POINT)
+    fp_rows = np.flatnonzero(types == FLANGE_POINT)
+    corner_ids = [names[i] for i in corner_rows]
+    fp_ids = [names[i] for i in fp_rows]
+    if not fp_ids or not corner_ids:
+        return fp_ids, corner_ids, np.empty((len(fp_ids), len(corner_ids)))
+    pts = tab.points_array
+    dists = cdist(pts[fp_rows], pts[corner_rows])
+    return fp_ids, corner_ids, dists
+
+
 def analyze_segment(seg, case_name):
     """Analyze a segment's geometry"""
 
-    print(f"\n{'='*70}")
+    print(f"\n{SEP}")
     print(f"SEGMENT ANALYSIS: {case_name}")
-    print(f"{'='*70}\n")
+    print(f"{SEP}\n")
     print(f"Number of tabs: {len(seg.tabs)}")
 
     if len(seg.tabs) != 3:
         print("WARNING: Not a two-bend segment!")
         return None
 
+    # FP-to-corner distance matrix per tab, shared by approach detection and FP analysis
+    fp_corner_dists = {tab_id: fp_corner_distances(tab) for tab_id, tab in seg.tabs.items()}
+
     # Determine which approach was used
     # Approach 1: All corners preserved in source tabs
     # Approach 2: One corner removed in tab_z
 
     approach = None
-    for tab_id, tab in seg.tabs.items():
-        if tab_id in ['tab_x', 'tab_z']:
-            corners = [k for k in tab.points.keys() if k in ['A', 'B', 'C', 'D']]
-            fp_points = [k for k in tab.points.keys() if k.startswith('FP')]
-
-            if len(corners) == 4:
-                # Check if FP are at corner positions
-                fp_coords = [tab.points[fp] for fp in fp_points]
-                corner_coords = [tab.points[c] for c in corners]
-
-                fp_at_corners = False
-                for fp_coord in fp_coords:
-                    for corner_coord in corner_coords:
-                        if np.linalg.norm(fp_coord - corner_coord) < 0.001:
-                            fp_at_corners = True
-                            break
-                    if fp_at_corners:
-                        break
-
-                if fp_at_corners:
-                    approach = "Approach 1 (90-degree)"
-            elif len(corners) == 3:
-                approach = "Approach 2 (fallback)"
+    for tab_id in ['tab_x', 'tab_z']:
+        if tab_id not in seg.tabs:
+            continue
+        _, corner_ids, dists = fp_corner_dists[tab_id]
+
+        if len(corner_ids) == 4:
+            # Check if FP are at corner positions
+            if dists.size and dists.min() < 0.001:
+                approach = "Approach 1 (90-degree)"
+        elif len(corner_ids) == 3:
+            approach = "Approach 2 (fallback)"
 
     if approach:
         print(f"*** DETECTED: {approach} ***\n")
 
     for tab_id, tab in seg.tabs.items():
-        print(f"\n{'-'*70}")
+        print(f"\n{DASH}")
         print(f"{tab_id}:")
         print(f"  Perimeter: {list(tab.points.keys())}")
 
         # Count point types
-        corners = {k: v for k, v in tab.points.items() if k in ['A', 'B', 'C', 'D']}
-        fp_points = {k: v for k, v in tab.points.items() if k.startswith('FP')}
-        bp_points = {k: v for k, v in tab.points.items() if k.startswith('BP')}
+        fp_ids, corner_ids, dists = fp_corner_dists[tab_id]
+        bp_count = np.count_nonzero(tab.point_types == BEND_POINT)
 
         print(f"\n  Point counts:")
-        print(f"    Corners: {len(corners)}")
-        print(f"    Flange Points (FP): {len(fp_points)}")
-        print(f"    Bend Points (BP): {len(bp_points)}")
+        print(f"    Corners: {len(corner_ids)}")
+        print(f"    Flange Points (FP): {len(fp_ids)}")
+        print(f"    Bend Points (BP): {bp_count}")
 
-        if corners:
-            print(f"  Corners present: {list(corners.keys())}")
+        if corner_ids:
+            print(f"  Corners present: {corner_ids}")
 
         # Check FP positions
-        if fp_points and corners:
+        if VERBOSE and fp_ids and corner_ids:
             print(f"\n  FP distance analysis:")
-            for fp_id, fp_coord in fp_points.items():
-                min_dist = min(np.linalg.norm(fp_coord - c_coord) for c_coord in corners.values())
-                nearest_corner = min(corners.items(), key=lambda x: np.linalg.norm(fp_coord - x[1]))
+            nearest_idx = dists.argmin(axis=1)
+            for fp_id, row, nearest in zip(fp_ids, dists, nearest_idx):
+                min_dist = row[nearest]
+                nearest_corner = corner_ids[nearest]
 
                 if min_dist < 0.01:
-                    print(f"    {fp_id}: AT CORNER {nearest_corner[0]} (dist={min_dist:.4f}mm)")
+                    print(f"    {fp_id}: AT CORNER {nearest_corner} (dist={min_dist:.4f}mm)")
                 else:
-                    print(f"    {fp_id}: {min_dist:.2f}mm from nearest corner {nearest_corner[0]}")
-
-        # Check for duplicate points
-        points_list = list(tab.points.items())
-        duplicates = []
-        for i in range(len(points_list)):
-            curr_id, curr_pt = points_list[i]
-            next_id, next_pt = points_list[(i+1) % len(points_list)]
-            dist = np.linalg.norm(next_pt - curr_pt)
-            if dist < 0.001:
-                duplicates.append((curr_id, next_id))
+                    print(f"    {fp_id}: {min_dist:.2f}mm from nearest corner {nearest_corner}")
+
+        # Check for duplicate points (each point against its successor, wrapping around)
+        names = tab.point_names
+        pts = tab.points_array
+        diffs = np.roll(pts, -1, axis=0) - pts
+        dup_idx = np.where(np.einsum('ij,ij->i', diffs, diffs) < 0.001 ** 2)[0]
+        duplicates = [(names[i], names[(i+1) % len(names)]) for i in dup_idx]
 
         if duplicates:
             print(f"\n  WARNING: Duplicate consecutive points: {duplicates}")
@@ -197,28 +206,22 @@ def main():
         "Unknown": 0
     }
 
-    print(f"\n{'#'*70}")
+    print(f"\n{HASH}")
     print(f"# COMPREHENSIVE TWO-BEND APPROACH TEST")
-    print(f"{'#'*70}\n")
+    print(f"{HASH}\n")
     print(f"Testing {len(test_cases)} different rectangle configurations\n")
 
+    # Build the parts and their segments for all test cases up front
+    segments_per_case = []
     for case_name, rectangles in test_cases:
-        print(f"\n{'='*70}")
-        print(f"TEST CASE: {case_name}")
-        print(f"{'='*70}")
+        part = Part(tabs={str(i): Tab(tab_id=str(i), rectangle=rect) for i, rect in enumerate(rectangles)})
+        segment = Part(sequence=['0', '1'], tabs={'tab_x': part.tabs['0'], 'tab_z': part.tabs['1']})
+        segments_per_case.append((case_name, segment))
 
-        # Create part with these rectangles
-        from src.hgen_sm.data import Tab
-        tabs_dict = {}
-        for i, rect in enumerate(rectangles):
-            tab = Tab(tab_id=str(i), rectangle=rect)
-            tabs_dict[str(i)] = tab
-
-        part = Part(tabs=tabs_dict)
-
-        # Create segment for the pair
-        segment_tabs = {'tab_x': part.tabs['0'], 'tab_z': part.tabs['1']}
-        segment = Part(sequence=['0', '1'], tabs=segment_tabs)
+    for case_name, segment in segments_per_case:
+        print(f"\n{SEP}")
+        print(f"TEST CASE: {case_name}")
+        print(f"{SEP}")
 
         # Generate segments
         segments = create_segments(segment, segment_cfg, filter_cfg)
@@ -239,14 +242,14 @@ def main():
             print("\nNo two-bend segments generated for this case")
 
     # Summary
-    print(f"\n\n{'#'*70}")
+    print(f"\n\n{HASH}")
     print(f"# SUMMARY")
-    print(f"{'#'*70}\n")
+    print(f"{HASH}\n")
     print(f"Approach distribution across test cases:")
     for approach, count in results.items():
         print(f"  {approach}: {count} cases")
 
-    print(f"\n{'#'*70}\n")
+    print(f"\n{HASH}\n")
 
 
 if __name__ == "__main__":
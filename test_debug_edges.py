@@ -1,22 +1,16 @@
 """
 Debug script to test edge selection in fallback two_bend approach
 """
-import yaml
-from pathlib import Path
+from src.hgen_sm import Part, create_segments
+from shared_setup import load_config, cached_initialize, cached_sequences
 
-PROJECT_ROOT = Path(__file__).resolve().parent
-CONFIG_FILE = PROJECT_ROOT / "config" / "config.yaml"
-from config.user_input import RECTANGLE_INPUTS
-with CONFIG_FILE.open("r") as f:
-    cfg = yaml.load(f, Loader=yaml.FullLoader)
-
-from src.hgen_sm import Part, initialize_objects, determine_sequences, create_segments
+cfg = load_config()
 
 segment_cfg = cfg.get('design_exploration')
 filter_cfg = cfg.get('filter')
 
-# Initialize part from config
-part = initialize_objects(RECTANGLE_INPUTS)
+# Initialize part from config (shared with the other scripts in this process)
+part = cached_initialize()
 
 print(f"\n{'='*60}")
 print(f"Testing edge selection in two_bend fallback approach")
@@ -24,7 +18,7 @@ print(f"Part has {len(part.tabs)} tabs: {list(part.tabs.keys())}")
 print(f"{'='*60}\n")
 
 # Get sequences
-variants = determine_sequences(part, cfg)
+variants = cached_sequences()
 
 # Process first variant
 variant_part, sequences = variants[0]
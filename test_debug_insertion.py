@@ -1,24 +1,20 @@
 """
 Debug script to understand which edge is selected and where insertion happens
 """
-import yaml
 import numpy as np
-from pathlib import Path
 
-PROJECT_ROOT = Path(__file__).resolve().parent
-CONFIG_FILE = PROJECT_ROOT / "config" / "config.yaml"
-from config.user_input import RECTANGLE_INPUTS
-with CONFIG_FILE.open("r") as f:
-    cfg = yaml.load(f, Loader=yaml.FullLoader)
+from shared_setup import load_config
+cfg = load_config()
 
-from src.hgen_sm import Part, initialize_objects, determine_sequences, create_segments
+from src.hgen_sm import Part, create_segments
+from src.hgen_sm.data.tab import FLANGE_POINT
+from shared_setup import cached_sequences
 
 segment_cfg = cfg.get('design_exploration')
 filter_cfg = cfg.get('filter')
 
-# Initialize
-part = initialize_objects(RECTANGLE_INPUTS)
-variants = determine_sequences(part, cfg)
+# Initialize (shared with the other scripts in this process)
+variants = cached_sequences()
 variant_part, sequences = variants[1]  # Separated variant
 
 print(f"Sequences: {sequences[0]}")
@@ -56,12 +52,13 @@ for i, seg in enumerate(segments):
         perimeter = list(tab_z_result.points.keys())
 
         # Check if flange is between A and B (correct) or after D (wrong)
-        fp_indices = [j for j, key in enumerate(perimeter) if key.startswith('FP')]
-        a_idx = perimeter.index('A') if 'A' in perimeter else -1
-        b_idx = perimeter.index('B') if 'B' in perimeter else -1
-        d_idx = perimeter.index('D') if 'D' in perimeter else -1
+        fp_indices = np.flatnonzero(tab_z_result.point_types == FLANGE_POINT)
+        position = tab_z_result.point_index
+        a_idx = position.get('A', -1)
+        b_idx = position.get('B', -1)
+        d_idx = position.get('D', -1)
 
-        if fp_indices:
+        if fp_indices.size:
             fp_idx = fp_indices[0]
 
             # Check if FP is between A and B (correct) or after D (wrong)
@@ -2,29 +2,24 @@
 Test script to verify export functionality works with fixed implementation.
 """
 
-import yaml
-from pathlib import Path
+import traceback
 
-PROJECT_ROOT = Path(__file__).resolve().parent
-CONFIG_FILE = PROJECT_ROOT / "config" / "config.yaml"
-from config.user_input import RECTANGLE_INPUTS
-
-with CONFIG_FILE.open("r") as f:
-    cfg = yaml.load(f, Loader=yaml.FullLoader)
+from shared_setup import load_config, cached_sequences
+cfg = load_config()
 
 from src.hgen_sm import Part
-from src.hgen_sm import initialize_objects, determine_sequences, create_segments, part_assembly
+from src.hgen_sm import create_segments, part_assembly
 from src.hgen_sm.export.part_export import export_to_json, export_to_onshape
 
+# Stop assembling once this many solutions are collected, a handful is enough to find one with intermediate tabs
+MAX_SOLUTIONS = 5
+
 def main():
     segment_cfg = cfg.get('design_exploration')
     filter_cfg = cfg.get('filter')
 
-    # ---- Import user input ----
-    part = initialize_objects(RECTANGLE_INPUTS)
-
-    # ---- Determine sensible Topologies ----
-    variants = determine_sequences(part, cfg)
+    # ---- Import user input, determine sensible Topologies (cached per process) ----
+    variants = cached_sequences()
 
     # ---- Find ways to connect pairs ----
     solutions = []
@@ -34,37 +29,45 @@ def main():
         variant_name = "separated" if any('_' in str(tid) for tid in variant_part.tabs.keys()) else "unseparated"
         print(f"\nProcessing {variant_name} variant with {len(variant_part.tabs)} tabs...")
 
+        # Pairs repeat across the sequences of a variant, create their segments only once
+        segments_cache = {}
+
         for sequence in sequences:
             segments_library = []
             for pair in sequence:
-                tab_x = variant_part.tabs[pair[0]]
-                tab_z = variant_part.tabs[pair[1]]
-                segment_tabs = {'tab_x': tab_x, 'tab_z': tab_z}
-                segment = Part(sequence=pair, tabs=segment_tabs)
-                segments_library.append(create_segments(segment, segment_cfg, filter_cfg))
+                pair_key = tuple(pair)
+                if pair_key not in segments_cache:
+                    tab_x = variant_part.tabs[pair[0]]
+                    tab_z = variant_part.tabs[pair[1]]
+                    segment_tabs = {'tab_x': tab_x, 'tab_z': tab_z}
+                    segment = Part(sequence=pair, tabs=segment_tabs)
+                    segments_cache[pair_key] = create_segments(segment, segment_cfg, filter_cfg)
+                segments_library.append(segments_cache[pair_key])
 
             # ---- Assemble Parts ----
-            combinations = [[segments_library[i][j] for i in range(len(segments_library))]
-                           for j in range(len(segments_library[0]))]
+            # Built lazily, the loop stops once MAX_SOLUTIONS parts are assembled.
+            # zip stops at the shortest segment list, pairs can have different numbers of segments
+            combinations = zip(*segments_library)
 
             for combination in combinations:
-                new_part = variant_part.copy()
+                new_part = variant_part.clone()
                 new_part.part_id = part_id
                 new_part.sequence = sequence
 
-                new_part = part_assembly(new_part, combination, filter_cfg)
+                # part_assembly merges into the segment tabs, keep the cached segments untouched
+                new_part = part_assembly(new_part, tuple(segment.clone() for segment in combination), filter_cfg)
                 if new_part:
                     solutions.append(new_part)
                     part_id += 1
 
                     # Collect multiple solutions to find one with intermediate tabs
-                    if len(solutions) >= 5:
+                    if len(solutions) >= MAX_SOLUTIONS:
                         break
 
-            if len(solutions) >= 5:
+            if len(solutions) >= MAX_SOLUTIONS:
                 break
 
-        if len(solutions) >= 5:
+        if len(solutions) >= MAX_SOLUTIONS:
             break
 
     print(f"\n{'='*60}")
@@ -72,15 +75,10 @@ def main():
     print(f"{'='*60}")
 
     # Find a solution with intermediate tabs (tab IDs like "01", "12")
-    test_part = None
-    for part in solutions:
-        for tab_id in part.tabs.keys():
-            if len(str(tab_id)) > 1 and not '_' in str(tab_id):
-                test_part = part
-                print(f"\nFound part with intermediate tabs: {list(part.tabs.keys())}")
-                break
-        if test_part:
-            break
+    test_part = next((part for part in solutions
+                      if any(len(str(tab_id)) > 1 and '_' not in str(tab_id) for tab_id in part.tabs)), None)
+    if test_part:
+        print(f"\nFound part with intermediate tabs: {list(test_part.tabs.keys())}")
 
     # Fallback to first solution if no intermediate tabs found
     if not test_part and len(solutions) > 0:
@@ -102,7 +100,6 @@ def main():
             print(f"[OK] JSON export successful: {json_path}")
         except Exception as e:
             print(f"[FAIL] JSON export failed: {e}")
-            import traceback
             traceback.print_exc()
 
         # Test Onshape FeatureScript export
@@ -112,7 +109,6 @@ def main():
             print(f"[OK] FeatureScript export successful")
         except Exception as e:
             print(f"[FAIL] FeatureScript export failed: {e}")
-            import traceback
             traceback.print_exc()
 
         print(f"\n{'='*60}")
@@ -1,24 +1,25 @@
 """
 Test to see what FP coordinates are actually being assigned to tabs
 """
-import yaml
+import os
+import sys
+
 import numpy as np
-from pathlib import Path
 
-PROJECT_ROOT = Path(__file__).resolve().parent
-CONFIG_FILE = PROJECT_ROOT / "config" / "config.yaml"
-from config.user_input import RECTANGLE_INPUTS
-with CONFIG_FILE.open("r") as f:
-    cfg = yaml.load(f, Loader=yaml.FullLoader)
+from shared_setup import load_config, cached_sequences
+cfg = load_config()
+
+from src.hgen_sm import Part, create_segments
+from src.hgen_sm.data.tab import FLANGE_POINT
 
-from src.hgen_sm import Part, initialize_objects, determine_sequences, create_segments
+# Point coordinates are only printed when someone reads them
+VERBOSE = sys.stdout.isatty() or bool(os.environ.get("SEGMENT_VERBOSE"))
 
 segment_cfg = cfg.get('design_exploration')
 filter_cfg = cfg.get('filter')
 
-# Initialize
-part = initialize_objects(RECTANGLE_INPUTS)
-variants = determine_sequences(part, cfg)
+# Initialize (shared with the other scripts in this process)
+variants = cached_sequences()
 variant_part, sequences = variants[1]  # Separated variant
 
 # Process BOTH pairs
@@ -32,15 +33,16 @@ for pair_idx, pair in enumerate(sequences[0]):
     tab_x = variant_part.tabs[pair[0]]
     tab_z = variant_part.tabs[pair[1]]
 
-    print(f"Tab {pair[0]} (tab_x) corners:")
-    for c_id in ['A', 'B', 'C', 'D']:
-        if c_id in tab_x.rectangle.points:
-            print(f"  {c_id}: {tab_x.rectangle.points[c_id]}")
+    if VERBOSE:
+        print(f"Tab {pair[0]} (tab_x) corners:")
+        for c_id in ['A', 'B', 'C', 'D']:
+            if c_id in tab_x.rectangle.points:
+                print(f"  {c_id}: {tab_x.rectangle.points[c_id]}")
 
-    print(f"\nTab {pair[1]} (tab_z) corners:")
-    for c_id in ['A', 'B', 'C', 'D']:
-        if c_id in tab_z.rectangle.points:
-            print(f"  {c_id}: {tab_z.rectangle.points[c_id]}")
+        print(f"\nTab {pair[1]} (tab_z) corners:")
+        for c_id in ['A', 'B', 'C', 'D']:
+            if c_id in tab_z.rectangle.points:
+                print(f"  {c_id}: {tab_z.rectangle.points[c_id]}")
 
     segment_tabs = {'tab_x': tab_x, 'tab_z': tab_z}
     segment = Part(sequence=pair, tabs=segment_tabs)
@@ -66,12 +68,13 @@ for pair_idx, pair in enumerate(sequences[0]):
 
                 # Check insertion order for tab_z
                 if tab_id == 'tab_z' and all(c in perimeter for c in ['A', 'B', 'D']):
-                    a_idx = perimeter.index('A')
-                    b_idx = perimeter.index('B')
-                    d_idx = perimeter.index('D')
-                    fp_indices = [i for i, k in enumerate(perimeter) if k.startswith('FP')]
+                    position = tab.point_index
+                    a_idx = position['A']
+                    b_idx = position['B']
+                    d_idx = position['D']
+                    fp_indices = np.flatnonzero(tab.point_types == FLANGE_POINT)
 
-                    if fp_indices:
+                    if fp_indices.size:
                         fp_idx = fp_indices[0]
                         if a_idx < fp_idx < b_idx:
                             print(f"  Insertion: OK (between A and B)")
@@ -82,7 +85,7 @@ for pair_idx, pair in enumerate(sequences[0]):
 
                 # Show FP points
                 fp_points = {k: v for k, v in tab.points.items() if k.startswith('FP')}
-                if fp_points:
+                if VERBOSE and fp_points:
                     print(f"  FP points:")
                     for fp_id, fp_coord in fp_points.items():
                         print(f"    {fp_id}: {fp_coord}")
@@ -1,24 +1,19 @@
 """
 Test one-bend geometry to verify Direct Power Flows implementation
 """
-import yaml
 import numpy as np
-from pathlib import Path
 
-PROJECT_ROOT = Path(__file__).resolve().parent
-CONFIG_FILE = PROJECT_ROOT / "config" / "config.yaml"
-from config.user_input import RECTANGLE_INPUTS
-with CONFIG_FILE.open("r") as f:
-    cfg = yaml.load(f, Loader=yaml.FullLoader)
+from shared_setup import load_config, cached_sequences
+cfg = load_config()
 
-from src.hgen_sm import Part, initialize_objects, determine_sequences, create_segments
+from src.hgen_sm import Part, create_segments
+from src.hgen_sm.data.tab import CORNER_POINT, FLANGE_POINT, BEND_POINT
 
 segment_cfg = cfg.get('design_exploration')
 filter_cfg = cfg.get('filter')
 
-# Initialize
-part = initialize_objects(RECTANGLE_INPUTS)
-variants = determine_sequences(part, cfg)
+# Initialize (shared with the other scripts in this process)
+variants = cached_sequences()
 variant_part, sequences = variants[0]  # Unseparated variant
 
 # Create segments for first pair
@@ -44,10 +39,13 @@ if one_bend_segments:
         print(f"\n{tab_id} (original tab {tab.tab_id}):")
         print(f"  Perimeter order: {list(tab.points.keys())}")
 
-        # Group points by type
-        corners = {k: v for k, v in tab.points.items() if k in ['A', 'B', 'C', 'D']}
-        fp_points = {k: v for k, v in tab.points.items() if k.startswith('FP')}
-        bp_points = {k: v for k, v in tab.points.items() if k.startswith('BP')}
+        # Group points by type (classified once per tab, see Tab.point_types)
+        names, types = tab.point_names, tab.point_types
+        is_corner = types == CORNER_POINT
+        is_fp = types == FLANGE_POINT
+        corners = {names[i]: tab.points[names[i]] for i in np.flatnonzero(is_corner)}
+        fp_points = {names[i]: tab.points[names[i]] for i in np.flatnonzero(is_fp)}
+        bp_points = {names[i]: tab.points[names[i]] for i in np.flatnonzero(types == BEND_POINT)}
 
         if corners:
             print(f"\n  Corners:")
@@ -55,14 +53,17 @@ if one_bend_segments:
                 print(f"    {c_id}: {c_coord}")
 
         if fp_points:
+            # Distances from every FP to every corner in one go (rows: FP, columns: corners)
+            pts = tab.points_array
+            fp_corner_dist = np.linalg.norm(pts[is_fp, None, :] - pts[None, is_corner, :], axis=2)
+
             print(f"\n  Flange Points (FP):")
-            for fp_id, fp_coord in fp_points.items():
+            for (fp_id, fp_coord), dists in zip(fp_points.items(), fp_corner_dist):
                 print(f"    {fp_id}: {fp_coord}")
 
                 # Check distance to nearest corner
                 if corners:
-                    min_dist = min(np.linalg.norm(fp_coord - c_coord) for c_coord in corners.values())
-                    print(f"      -> Distance to nearest corner: {min_dist:.2f}mm")
+                    print(f"      -> Distance to nearest corner: {dists.min():.2f}mm")
 
         if bp_points:
             print(f"\n  Bend Points (BP):")
@@ -71,17 +72,14 @@ if one_bend_segments:
 
         # Check perimeter flow
         print(f"\n  Perimeter flow check:")
-        points_list = list(tab.points.items())
-        total_length = 0
-        for i in range(len(points_list)):
-            curr_id, curr_pt = points_list[i]
-            next_id, next_pt = points_list[(i+1) % len(points_list)]
-            edge_length = np.linalg.norm(next_pt - curr_pt)
-            total_length += edge_length
+        names = tab.point_names
+        pts = tab.points_array
+        edge_lengths = np.linalg.norm(np.roll(pts, -1, axis=0) - pts, axis=1)
+        for i, edge_length in enumerate(edge_lengths):
             if edge_length > 1.0:  # Only show significant edges
-                print(f"    {curr_id} -> {next_id}: {edge_length:.2f}mm")
+                print(f"    {names[i]} -> {names[(i+1) % len(names)]}: {edge_length:.2f}mm")
 
-        print(f"  Total perimeter: {total_length:.2f}mm")
+        print(f"  Total perimeter: {edge_lengths.sum():.2f}mm")
 
     print(f"\n{'='*70}\n")
 else:
@@ -1,23 +1,18 @@
 """
 Direct test of one_bend function with input B geometry
 """
-import yaml
 import numpy as np
-from pathlib import Path
 
-PROJECT_ROOT = Path(__file__).resolve().parent
-CONFIG_FILE = PROJECT_ROOT / "config" / "config.yaml"
-from config.user_input import RECTANGLE_INPUTS
-with CONFIG_FILE.open("r") as f:
-    cfg = yaml.load(f, Loader=yaml.FullLoader)
+from shared_setup import load_config, cached_initialize
+cfg = load_config()
 
-from src.hgen_sm import Part, initialize_objects
+from src.hgen_sm import Part
 from src.hgen_sm.create_segments.bend_strategies import one_bend
 
 filter_cfg = cfg.get('filter')
 
-# Initialize
-part = initialize_objects(RECTANGLE_INPUTS)
+# Initialize (shared with the other scripts in this process)
+part = cached_initialize()
 
 # Get tabs 0 and 1
 tab_0 = part.tabs['0']
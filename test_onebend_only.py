@@ -1,25 +1,25 @@
 """
 Test script to check all one-bend solutions for input B
 """
-import yaml
+import sys
 import numpy as np
-from pathlib import Path
-import json
 
-PROJECT_ROOT = Path(__file__).resolve().parent
-CONFIG_FILE = PROJECT_ROOT / "config" / "config.yaml"
-from config.user_input import RECTANGLE_INPUTS
-with CONFIG_FILE.open("r") as f:
-    cfg = yaml.load(f, Loader=yaml.FullLoader)
+from shared_setup import load_config, cached_sequences
+cfg = load_config()
 
-from src.hgen_sm import Part, initialize_objects, determine_sequences, create_segments, part_assembly
+from src.hgen_sm import Part, create_segments, part_assembly
+from src.hgen_sm.export.part_export import export_to_json
+
+CORNERS = frozenset('ABCD')
+
+# Serializing every solution is only done on request
+EXPORT = "--export" in sys.argv[1:]
 
 segment_cfg = cfg.get('design_exploration')
 filter_cfg = cfg.get('filter')
 
-# Initialize
-part = initialize_objects(RECTANGLE_INPUTS)
-variants = determine_sequences(part, cfg)
+# Initialize (shared with the other scripts in this process)
+variants = cached_sequences()
 
 print(f"Found {len(variants)} variant(s)\n")
 
@@ -28,16 +28,20 @@ for variant_idx, (variant_part, sequences) in enumerate(variants):
     print(f"VARIANT {variant_idx}: {len(variant_part.tabs)} tabs")
     print(f"{'='*70}\n")
 
-    # Create segments for each sequence
+    # Create segments for each sequence (pairs repeat across sequences, create them only once)
+    segments_cache = {}
     all_solutions = []
     for sequence in sequences:
         segments_library = []
         for pair in sequence:
-            tab_x = variant_part.tabs[pair[0]]
-            tab_z = variant_part.tabs[pair[1]]
-            segment_tabs = {'tab_x': tab_x, 'tab_z': tab_z}
-            segment = Part(sequence=pair, tabs=segment_tabs)
-            segments_library.append(create_segments(segment, segment_cfg, filter_cfg))
+            pair_key = tuple(pair)
+            if pair_key not in segments_cache:
+                tab_x = variant_part.tabs[pair[0]]
+                tab_z = variant_part.tabs[pair[1]]
+                segment_tabs = {'tab_x': tab_x, 'tab_z': tab_z}
+                segment = Part(sequence=pair, tabs=segment_tabs)
+                segments_cache[pair_key] = create_segments(segment, segment_cfg, filter_cfg)
+            segments_library.append(segments_cache[pair_key])
 
         # Assemble parts
         solutions = part_assembly(variant_part, segments_library, filter_cfg)
@@ -59,14 +63,15 @@ for variant_idx, (variant_part, sequences) in enumerate(variants):
 
         for tab_id, tab in sol.tabs.items():
             print(f"Tab {tab_id}:")
-            perimeter = list(tab.points.keys())
-            print(f"  Perimeter: {perimeter}")
+            perimeter = tab.point_names
+            point_index = tab.point_index
+            print(f"  Perimeter: {list(perimeter)}")
 
             # Check for BP ordering
             bp_keys = [k for k in perimeter if k.startswith('BP')]
             if len(bp_keys) == 2:
-                bp1_idx = perimeter.index(bp_keys[0])
-                bp2_idx = perimeter.index(bp_keys[1])
+                bp1_idx = point_index[bp_keys[0]]
+                bp2_idx = point_index[bp_keys[1]]
 
                 # Get BP coordinates
                 bp1 = tab.points[bp_keys[0]]
@@ -77,32 +82,22 @@ for variant_idx, (variant_part, sequences) in enumerate(variants):
 
                 # Check for self-intersection
                 # Get corners before and after BP sequence
-                corners = [k for k in perimeter if k in ['A', 'B', 'C', 'D']]
+                corners = [k for k in perimeter if k in CORNERS]
                 if len(corners) >= 2:
                     # Find corners surrounding BP sequence
-                    corner_indices = [(k, perimeter.index(k)) for k in corners]
-                    corner_indices.sort(key=lambda x: x[1])
+                    corner_indices = sorted(point_index[k] for k in corners)
 
                     bp_indices = sorted([bp1_idx, bp2_idx])
                     bp_range = (min(bp_indices), max(bp_indices))
 
                     # Check if perimeter goes backward
-                    prev_idx = None
-                    increasing = True
-                    for i, (corner, idx) in enumerate(corner_indices):
-                        if prev_idx is not None:
-                            if idx < prev_idx:
-                                increasing = False
-                        prev_idx = idx
+                    increasing = bool(np.all(np.diff(corner_indices) >= 0))
 
                     if not increasing:
                         print(f"  WARNING: Perimeter may have self-intersection!")
             print()
 
-        # Export this solution to JSON for inspection
-        from src.hgen_sm.export.part_export import export_to_json, export_to_featurescript
-
-        json_output = export_to_json(sol, part.tabs)
-        print(f"JSON preview:")
-        print(json.dumps(json_output, indent=2)[:500])
-        print("...\n")
+        # Export this solution to JSON for inspection (only with --export)
+        if EXPORT:
+            export_to_json(sol)
+            print()
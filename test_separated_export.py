@@ -2,29 +2,21 @@
 Test export specifically for separated surfaces (the problematic case).
 """
 
-import yaml
-from pathlib import Path
+import traceback
 
-PROJECT_ROOT = Path(__file__).resolve().parent
-CONFIG_FILE = PROJECT_ROOT / "config" / "config.yaml"
-from config.user_input import RECTANGLE_INPUTS
-
-with CONFIG_FILE.open("r") as f:
-    cfg = yaml.load(f, Loader=yaml.FullLoader)
+from shared_setup import load_config, cached_sequences
+cfg = load_config()
 
 from src.hgen_sm import Part
-from src.hgen_sm import initialize_objects, determine_sequences, create_segments, part_assembly
-from src.hgen_sm.export.part_export import export_to_onshape
+from src.hgen_sm import create_segments, part_assembly
+from src.hgen_sm.export.part_export import export_to_json, export_to_onshape
 
 def main():
     segment_cfg = cfg.get('design_exploration')
     filter_cfg = cfg.get('filter')
 
-    # ---- Import user input ----
-    part = initialize_objects(RECTANGLE_INPUTS)
-
-    # ---- Determine sensible Topologies ----
-    variants = determine_sequences(part, cfg)
+    # ---- Import user input, determine sensible Topologies (cached per process) ----
+    variants = cached_sequences()
 
     # ---- Find ways to connect pairs ----
     solutions = []
@@ -41,6 +33,9 @@ def main():
         print(f"\nProcessing {variant_name} variant with {len(variant_part.tabs)} tabs...")
         print(f"Tab IDs: {list(variant_part.tabs.keys())}")
 
+        # Pairs repeat across the sequences of a variant, create their segments only once
+        segments_cache = {}
+
         for sequence in sequences:
             print(f"  Sequence: {sequence}")
             print(f"  Tab geometries:")
@@ -51,11 +46,14 @@ def main():
                     print(f"    Tab {tid}: {corners}")
             segments_library = []
             for pair in sequence:
-                tab_x = variant_part.tabs[pair[0]]
-                tab_z = variant_part.tabs[pair[1]]
-                segment_tabs = {'tab_x': tab_x, 'tab_z': tab_z}
-                segment = Part(sequence=pair, tabs=segment_tabs)
-                segs = create_segments(segment, segment_cfg, filter_cfg)
+                pair_key = tuple(pair)
+                if pair_key not in segments_cache:
+                    tab_x = variant_part.tabs[pair[0]]
+                    tab_z = variant_part.tabs[pair[1]]
+                    segment_tabs = {'tab_x': tab_x, 'tab_z': tab_z}
+                    segment = Part(sequence=pair, tabs=segment_tabs)
+                    segments_cache[pair_key] = create_segments(segment, segment_cfg, filter_cfg)
+                segs = segments_cache[pair_key]
                 print(f"    Connection {pair[0]}->{pair[1]}: {len(segs) if segs else 0} segments")
                 if not segs or len(segs) == 0:
                     print(f"    WARNING: No valid segments found for {pair[0]}->{pair[1]}")
@@ -70,15 +68,16 @@ def main():
             # Generate combinations - use minimum length to avoid index errors
             min_segments = min(len(segs) for segs in segments_library)
             print(f"    Generating {min_segments} combinations from segment lists of sizes {[len(s) for s in segments_library]}")
-            combinations = [[segments_library[i][j] for i in range(len(segments_library))]
-                           for j in range(min_segments)]
+            # Built lazily, the loop stops at the first assembled part
+            combinations = zip(*segments_library)
 
             for combination in combinations:
-                new_part = variant_part.copy()
+                new_part = variant_part.clone()
                 new_part.part_id = part_id
                 new_part.sequence = sequence
 
-                new_part = part_assembly(new_part, combination, filter_cfg)
+                # part_assembly merges into the segment tabs, keep the cached segments untouched
+                new_part = part_assembly(new_part, tuple(segment.clone() for segment in combination), filter_cfg)
                 if new_part:
                     solutions.append(new_part)
                     part_id += 1
@@ -109,7 +108,6 @@ def main():
             print(f"  {list(test_part.tabs['0_0'].points.keys())}")
 
         # Test JSON export first
-        from src.hgen_sm.export.part_export import export_to_json
         try:
             print(f"\nExporting to JSON...")
             json_path = export_to_json(test_part, output_dir="exports_test_separated")
@@ -132,7 +130,6 @@ def main():
             print(f"  3. All tabs union correctly")
         except Exception as e:
             print(f"[FAIL] FeatureScript export failed: {e}")
-            import traceback
             traceback.print_exc()
     else:
         print("No separated surface solutions found")
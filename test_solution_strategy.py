@@ -3,35 +3,10 @@ Test different strategies for determining correct point ordering.
 """
 import numpy as np
 
-def diagonals_cross_3d_original(p0, p3, p4, p7):
-    """Current implementation from bend_strategies.py"""
-    def segments_intersect_2d(a1, a2, b1, b2):
-        d1 = np.array([a2[0] - a1[0], a2[1] - a1[1]], dtype=float)
-        d2 = np.array([b2[0] - b1[0], b2[1] - b1[1]], dtype=float)
-
-        cross = d1[0] * d2[1] - d1[1] * d2[0]
-        if abs(cross) < 1e-10:
-            return False
-
-        diff = np.array([b1[0] - a1[0], b1[1] - a1[1]], dtype=float)
-        t = (diff[0] * d2[1] - diff[1] * d2[0]) / cross
-        s = (diff[0] * d1[1] - diff[1] * d1[0]) / cross
-
-        return 0.01 < t < 0.99 and 0.01 < s < 0.99
-
-    p0, p3, p4, p7 = np.array(p0), np.array(p3), np.array(p4), np.array(p7)
-
-    # Check XY, XZ, YZ projections
-    if segments_intersect_2d(p3[:2], p4[:2], p7[:2], p0[:2]):
-        return True
-    if segments_intersect_2d([p3[0], p3[2]], [p4[0], p4[2]],
-                              [p7[0], p7[2]], [p0[0], p0[2]]):
-        return True
-    if segments_intersect_2d([p3[1], p3[2]], [p4[1], p4[2]],
-                              [p7[1], p7[2]], [p0[1], p0[2]]):
-        return True
-
-    return False
+# Current implementation from bend_strategies.py, and the improved method (diagonal crossing
+# check with distance fallback) that was adopted there
+from src.hgen_sm.create_segments.bend_strategies import diagonals_cross_3d as diagonals_cross_3d_original
+from src.hgen_sm.create_segments.bend_strategies import should_swap_z_side_ordering as should_swap_ordering_improved
 
 
 def should_swap_ordering_distance_based(FPyxL, FPyxR, FPyzR, FPyzL):
@@ -62,40 +37,6 @@ def should_swap_ordering_distance_based(FPyxL, FPyxR, FPyzR, FPyzL):
     return total_swapped < total_default
 
 
-def should_swap_ordering_improved(FPyxL, FPyxR, FPyzR, FPyzL):
-    """
-    Improved ordering determination combining diagonal crossing check with distance fallback.
-
-    Returns True if z-side L/R should be swapped.
-    """
-    # First, try the diagonal crossing check
-    crosses = diagonals_cross_3d_original(FPyxL, FPyxR, FPyzR, FPyzL)
-
-    # Check if we're in a collinear/degenerate case by comparing distances
-    FPyxL = np.array(FPyxL)
-    FPyxR = np.array(FPyxR)
-    FPyzR = np.array(FPyzR)
-    FPyzL = np.array(FPyzL)
-
-    # Default ordering distances
-    dist_default_1 = np.linalg.norm(FPyzR - FPyxR)
-    dist_default_2 = np.linalg.norm(FPyxL - FPyzL)
-    total_default = dist_default_1 + dist_default_2
-
-    # Swapped ordering distances
-    dist_swapped_1 = np.linalg.norm(FPyzL - FPyxR)
-    dist_swapped_2 = np.linalg.norm(FPyxL - FPyzR)
-    total_swapped = dist_swapped_1 + dist_swapped_2
-
-    # If distance difference is significant, use distance-based decision
-    # This handles collinear cases where diagonal crossing check fails
-    if abs(total_default - total_swapped) > 1.0:
-        return total_swapped < total_default
-
-    # Otherwise, trust the diagonal crossing check
-    return crosses
-
-
 # Test cases
 test_cases = [
     {
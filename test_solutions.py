@@ -4,29 +4,22 @@ Test script to verify the fixes:
 2. Parallel edge cases work correctly
 3. FP points are at correct corners
 """
-import yaml
 import json
-import copy
-import itertools
-from pathlib import Path
+import numpy as np
 
-PROJECT_ROOT = Path(__file__).resolve().parent
-CONFIG_FILE = PROJECT_ROOT / "config" / "config.yaml"
-from config.user_input import RECTANGLE_INPUTS
-with CONFIG_FILE.open("r") as f:
-    cfg = yaml.load(f, Loader=yaml.FullLoader)
+from shared_setup import load_config, cached_sequences
+cfg = load_config()
 
-from src.hgen_sm import Part, initialize_objects, determine_sequences, create_segments, part_assembly
+from src.hgen_sm import Part, create_segments, part_assembly, compatible_combinations
+
+CORNERS = frozenset('ABCD')
 
 segment_cfg = cfg.get('design_exploration')
 filter_cfg = cfg.get('filter')
 assy_filter_cfg = cfg.get('filter')
 
-# Initialize part
-part = initialize_objects(RECTANGLE_INPUTS)
-
-# Get sequences
-variants = determine_sequences(part, cfg)
+# Initialize part and get sequences (shared with the other scripts in this process)
+variants = cached_sequences()
 
 print(f"\n{'='*70}")
 print(f"SOLUTION SUMMARY")
@@ -40,16 +33,22 @@ for variant_part, sequences in variants:
     print(f"\n{variant_name.upper()} variant ({len(variant_part.tabs)} tabs):")
     print(f"  Tabs: {list(variant_part.tabs.keys())}")
 
+    # Pairs repeat across the sequences of a variant, create their segments only once
+    segments_cache = {}
+
     for seq_idx, sequence in enumerate(sequences):
         print(f"\n  Sequence {seq_idx}: {sequence}")
 
         segments_library = []
         for pair in sequence:
-            tab_x = variant_part.tabs[pair[0]]
-            tab_z = variant_part.tabs[pair[1]]
-            segment_tabs = {'tab_x': tab_x, 'tab_z': tab_z}
-            segment = Part(sequence=pair, tabs=segment_tabs)
-            segments = create_segments(segment, segment_cfg, filter_cfg)
+            pair_key = tuple(pair)
+            if pair_key not in segments_cache:
+                tab_x = variant_part.tabs[pair[0]]
+                tab_z = variant_part.tabs[pair[1]]
+                segment_tabs = {'tab_x': tab_x, 'tab_z': tab_z}
+                segment = Part(sequence=pair, tabs=segment_tabs)
+                segments_cache[pair_key] = create_segments(segment, segment_cfg, filter_cfg)
+            segments = segments_cache[pair_key]
 
             # Count one-bend vs two-bend
             one_bend_count = sum(1 for seg in segments if len(seg.tabs) == 2)
@@ -59,11 +58,11 @@ for variant_part, sequences in variants:
             segments_library.append(segments)
 
         # Assemble parts
-        variant_part.sequence = sequence
         seq_solutions = []
-        for segments_combination in itertools.product(*segments_library):
-            new_part = variant_part.copy()
-            new_segments_combination = copy.deepcopy(segments_combination)
+        for segments_combination in compatible_combinations(segments_library, assy_filter_cfg):
+            new_part = variant_part.cow_copy()
+            new_part.sequence = sequence
+            new_segments_combination = tuple(segment.clone() for segment in segments_combination)
             new_part = part_assembly(new_part, new_segments_combination, assy_filter_cfg)
             if new_part != None:
                 seq_solutions.append(new_part)
@@ -93,19 +92,18 @@ if all_solutions:
                 print(f"  {fp_id}: {fp_coord}")
 
             # Check if FP points match corners
-            corners = {k: v for k, v in tab_1.points.items() if k in ['A', 'B', 'C', 'D']}
+            corners = {k: v for k, v in tab_1.points.items() if k in CORNERS}
             print(f"\nCorners in tab 1:")
             for c_id, c_coord in corners.items():
                 print(f"  {c_id}: {c_coord}")
 
             # Check for spikes (consecutive points at very different Z values)
-            points_list = list(tab_1.points.items())
+            names = tab_1.point_names
+            pts = tab_1.points_array
+            steps = np.roll(pts, -1, axis=0) - pts
+            gaps_sq = np.einsum('ij,ij->i', steps, steps)
             print(f"\nChecking for spikes in perimeter order:")
-            for i in range(len(points_list)):
-                curr_id, curr_pt = points_list[i]
-                next_id, next_pt = points_list[(i+1) % len(points_list)]
-                dist = ((curr_pt - next_pt)**2).sum()**0.5
-                if dist > 50:  # Large jump
-                    print(f"  WARNING: Large jump from {curr_id} to {next_id}, distance={dist:.1f}")
+            for i in np.flatnonzero(gaps_sq > 50 ** 2):  # Large jump
+                print(f"  WARNING: Large jump from {names[i]} to {names[(i+1) % len(names)]}, distance={np.sqrt(gaps_sq[i]):.1f}")
 
 print("\nTest complete!")
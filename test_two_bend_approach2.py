@@ -1,24 +1,24 @@
 """
 Test two-bend approach 2 (fallback) to verify point ordering fix
 """
-import yaml
+import os
+import sys
 import numpy as np
-from pathlib import Path
 
-PROJECT_ROOT = Path(__file__).resolve().parent
-CONFIG_FILE = PROJECT_ROOT / "config" / "config.yaml"
-from config.user_input import RECTANGLE_INPUTS
-with CONFIG_FILE.open("r") as f:
-    cfg = yaml.load(f, Loader=yaml.FullLoader)
+from shared_setup import load_config, cached_sequences
+cfg = load_config()
 
-from src.hgen_sm import Part, initialize_objects, determine_sequences, create_segments
+from src.hgen_sm import Part, create_segments
+from src.hgen_sm.data.tab import CORNER_POINT, FLANGE_POINT, BEND_POINT
 
 segment_cfg = cfg.get('design_exploration')
 filter_cfg = cfg.get('filter')
 
-# Initialize
-part = initialize_objects(RECTANGLE_INPUTS)
-variants = determine_sequences(part, cfg)
+# Point coordinates and edge listings are only printed when someone reads them
+VERBOSE = sys.stdout.isatty() or bool(os.environ.get("SEGMENT_VERBOSE"))
+
+# Initialize (shared with the other scripts in this process)
+variants = cached_sequences()
 variant_part, sequences = variants[0]  # Unseparated variant
 
 # Create segments for first pair
@@ -48,10 +48,14 @@ if two_bend_segments:
         print(f"{tab_id} (original tab {tab.tab_id}):")
         print(f"  Perimeter order: {list(tab.points.keys())}")
 
-        # Group points by type
-        corners = {k: v for k, v in tab.points.items() if k in ['A', 'B', 'C', 'D']}
-        fp_points = {k: v for k, v in tab.points.items() if k.startswith('FP')}
-        bp_points = {k: v for k, v in tab.points.items() if k.startswith('BP')}
+        # Group points by type, using the type array cached on the tab
+        names = tab.point_names
+        pts = tab.points_array
+        is_corner = tab.point_types == CORNER_POINT
+        is_fp = tab.point_types == FLANGE_POINT
+        corners = {names[i]: pts[i] for i in np.flatnonzero(is_corner)}
+        fp_points = {names[i]: pts[i] for i in np.flatnonzero(is_fp)}
+        bp_points = {names[i]: pts[i] for i in np.flatnonzero(tab.point_types == BEND_POINT)}
 
         print(f"\n  Point counts:")
         print(f"    Corners: {len(corners)}")
@@ -60,39 +64,38 @@ if two_bend_segments:
 
         if corners:
             print(f"\n  Corners present: {list(corners.keys())}")
-            for c_id, c_coord in corners.items():
-                print(f"    {c_id}: {c_coord}")
+            if VERBOSE:
+                for c_id, c_coord in corners.items():
+                    print(f"    {c_id}: {c_coord}")
         else:
             print(f"\n  WARNING: No corners found!")
 
         if fp_points:
+            # Distances from every FP to every corner in one go (rows: FP, columns: corners)
+            fp_corner_dist = np.linalg.norm(pts[is_fp, None, :] - pts[None, is_corner, :], axis=2)
+            corner_ids = list(corners.keys())
+
             print(f"\n  Flange Points (FP):")
-            for fp_id, fp_coord in fp_points.items():
-                print(f"    {fp_id}: {fp_coord}")
+            for (fp_id, fp_coord), dists in zip(fp_points.items(), fp_corner_dist):
+                print(f"    {fp_id}: {fp_coord}" if VERBOSE else f"    {fp_id}")
 
                 # Check distance to nearest corner
                 if corners:
-                    min_dist = min(np.linalg.norm(fp_coord - c_coord) for c_coord in corners.values())
-                    nearest_corner = min(corners.items(), key=lambda x: np.linalg.norm(fp_coord - x[1]))
-                    print(f"      -> Distance to nearest corner {nearest_corner[0]}: {min_dist:.2f}mm")
+                    nearest = int(np.argmin(dists))
+                    print(f"      -> Distance to nearest corner {corner_ids[nearest]}: {dists[nearest]:.2f}mm")
 
-        if bp_points:
+        if VERBOSE and bp_points:
             print(f"\n  Bend Points (BP):")
             for bp_id, bp_coord in bp_points.items():
                 print(f"    {bp_id}: {bp_coord}")
 
         # Verify perimeter validity
         print(f"\n  Perimeter validation:")
-        points_list = list(tab.points.items())
+        next_names = names[1:] + names[:1]
+        edge_lengths = np.linalg.norm(np.roll(pts, -1, axis=0) - pts, axis=1)
 
         # Check for consecutive duplicates
-        duplicates = []
-        for i in range(len(points_list)):
-            curr_id, curr_pt = points_list[i]
-            next_id, next_pt = points_list[(i+1) % len(points_list)]
-            dist = np.linalg.norm(next_pt - curr_pt)
-            if dist < 0.001:
-                duplicates.append((curr_id, next_id))
+        duplicates = [(names[i], next_names[i]) for i in np.flatnonzero(edge_lengths < 0.001)]
 
         if duplicates:
             print(f"    WARNING: Found duplicate consecutive points: {duplicates}")
@@ -101,14 +104,10 @@ if two_bend_segments:
 
         # Check edge flow
         print(f"\n  Edge flow:")
-        total_length = 0
-        for i in range(len(points_list)):
-            curr_id, curr_pt = points_list[i]
-            next_id, next_pt = points_list[(i+1) % len(points_list)]
-            edge_length = np.linalg.norm(next_pt - curr_pt)
-            total_length += edge_length
-            if edge_length > 1.0:
-                print(f"    {curr_id} -> {next_id}: {edge_length:.2f}mm")
+        total_length = edge_lengths.sum()
+        if VERBOSE:
+            for i in np.flatnonzero(edge_lengths > 1.0):
+                print(f"    {names[i]} -> {next_names[i]}: {edge_lengths[i]:.2f}mm")
 
         print(f"  Total perimeter: {total_length:.2f}mm")
 
@@ -119,21 +118,20 @@ if two_bend_segments:
         # Find the intermediate tab (the one with two bend connections)
         intermediate_tabs = []
         for tab_id, tab in seg.tabs.items():
-            fp_count = len([k for k in tab.points.keys() if k.startswith('FP')])
+            fp_count = np.count_nonzero(tab.point_types == FLANGE_POINT)
             if fp_count >= 4:  # Intermediate tab should have FP from both connections
-                intermediate_tabs.append((tab_id, tab))
+                intermediate_tabs.append((tab_id, tab, fp_count))
 
         if intermediate_tabs:
             print(f"Intermediate tab analysis:")
-            for tab_id, tab in intermediate_tabs:
+            for tab_id, tab, fp_count in intermediate_tabs:
                 print(f"\n  {tab_id}:")
                 print(f"    Perimeter: {list(tab.points.keys())}")
                 print(f"    Total points: {len(tab.points)}")
 
                 # Expected structure: [FPyxL, BPxL, BPxR, FPyxR, FPyzR, BPzR, BPzL, FPyzL]
                 # or similar, with 8 points total (4 FP, 4 BP)
-                fp_count = len([k for k in tab.points.keys() if k.startswith('FP')])
-                bp_count = len([k for k in tab.points.keys() if k.startswith('BP')])
+                bp_count = np.count_nonzero(tab.point_types == BEND_POINT)
                 print(f"    FP count: {fp_count} (expected: 4)")
                 print(f"    BP count: {bp_count} (expected: 4)")
 